@@ -1,11 +1,15 @@
-import random
+import json
+import sys
 from pathlib import Path
-import pandas as pd
 import argparse
 
-from src.items import build_items_universe_df, sample_items_dataset_df
-from src.customers import generate_customers_df
-from src.sales import generate_customer_sales_rows
+# Only lightweight modules at import time: pandas/NumPy/Faker are imported by the stage
+# that needs them (see main), so `run.py -h` and small runs skip their import cost.
+from src.settings import SETTINGS_UNIVERSE, STORE_IDS
+from src.cache import CACHE_DIR, CACHE_MAX_BYTES, ArtifactCache
+from src.sales import generate_sales_rows
+from src.samplers import build_product_samplers, build_store_sampler
+from src.profiles import SETTINGS_PROFILES, ProfileSampler, build_profile_tables, load_profiles, save_profiles, validate_profiles
 
 # N_CUSTOMERS = 1_000 # 300_000
 # DATE_FROM = "2015-01-01"
@@ -13,6 +17,8 @@ from src.sales import generate_customer_sales_rows
 
 OUT_DIR = Path("output_csv")
 
+SALES_WRITE_BATCH_ROWS = 100_000
+
 def parse_args():
     p = argparse.ArgumentParser(description="Generate synthetic ERP/CRM datasets (items, customers, sales)")
 
@@ -43,14 +49,80 @@ def parse_args():
     # Locale
     p.add_argument("--faker-locale", default="en_US")
 
+    # Popularity (defaults come from SETTINGS_UNIVERSE["popularity"])
+    popularity = SETTINGS_UNIVERSE["popularity"]
+    p.add_argument("--product-zipf-s", type=float, default=popularity["product_zipf_s"],
+                   help="Zipf exponent for product popularity within each category (0 => uniform)")
+    p.add_argument("--product-weights", default=None,
+                   help="JSON file with explicit weights by product_name, e.g. {\"AromaDrive USB Cable\": 5}")
+    p.add_argument("--store-weights", default=None,
+                   help="Comma-separated store_id:weight pairs, e.g. 101:5,102:2 (unlisted stores => 1.0)")
+
+    # Behavior profiles
+    p.add_argument("--profiles-file", default=None,
+                   help="JSON file with behavior profiles (default: SETTINGS_PROFILES in src/profiles.py)")
+
+    # Cache (item universe, name pools) between runs
+    p.add_argument("--cache-dir", default=str(CACHE_DIR), help="Directory for cached artifacts")
+    p.add_argument("--cache-max-mb", type=float, default=CACHE_MAX_BYTES / (1024 * 1024),
+                   help="Cache size cap in MB (least recently used entries are evicted)")
+    p.add_argument("--no-cache", action="store_true", help="Build everything from scratch, do not read/write the cache")
+
     return p.parse_args()
 
+
+def popularity_settings_from_args(args) -> dict:
+    """
+    SETTINGS_UNIVERSE["popularity"] with CLI overrides applied.
+    """
+    out = dict(SETTINGS_UNIVERSE["popularity"])
+    out["product_zipf_s"] = args.product_zipf_s
+
+    if args.product_weights:
+        with open(args.product_weights, encoding="utf-8") as f:
+            out["product_weights"] = {**out.get("product_weights", {}), **json.load(f)}
+
+    if args.store_weights:
+        store_weights = dict(out.get("store_weights", {}))
+        for pair in args.store_weights.split(","):
+            sid, _, w = pair.partition(":")
+            if not w:
+                raise ValueError(f"--store-weights expects store_id:weight pairs, got {pair!r}.")
+            store_weights[int(sid)] = float(w)
+        out["store_weights"] = store_weights
+
+    return out
+
 def main():
     print('data generation - started')
 
     args = parse_args()
 
-    universe = build_items_universe_df()
+    cache = ArtifactCache(
+        args.cache_dir,
+        max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        enabled=not args.no_cache,
+    )
+
+    # Behavior profiles (checked before any output is written; saved next to the outputs
+    # so profile_id can be resolved later)
+    if args.profiles_file:
+        profiles = load_profiles(args.profiles_file)
+    else:
+        profiles = validate_profiles(SETTINGS_PROFILES["params"])
+    save_profiles(profiles, OUT_DIR / "profiles.json")
+
+    # ITEMS
+    from src.items import build_items_universe_df, sample_items_dataset_df, universe_from_arrays, universe_to_arrays
+
+    universe = cache.get_or_build(
+        "universe",
+        # Popularity only weights picks later (samplers), the universe itself does not depend on it
+        [{k: v for k, v in SETTINGS_UNIVERSE.items() if k != "popularity"}],
+        build_items_universe_df,
+        to_arrays=universe_to_arrays,
+        from_arrays=universe_from_arrays,
+    )
 
     df_items = sample_items_dataset_df(
         universe,
@@ -62,6 +134,16 @@ def main():
     )
     df_items.to_csv(OUT_DIR / "items.csv", index=False)
 
+    # CUSTOMERS
+    from src.customers import NAME_POOL_SIZE, build_name_pools, generate_customers_df
+
+    name_pools = cache.get_or_build(
+        "name_pools",
+        [args.faker_locale, NAME_POOL_SIZE],
+        lambda: build_name_pools(args.faker_locale, NAME_POOL_SIZE),
+        to_arrays=lambda pools: pools,
+        from_arrays=lambda arrays: arrays,
+    )
 
     df_customers = generate_customers_df(
         faker_locale=args.faker_locale,
@@ -76,66 +158,58 @@ def main():
         p_sms_opt_in=args.p_sms_opt_in,     # only if phone exists
         p_call_opt_in=args.p_call_opt_in,    # only if phone exists
         blank="",
+        profile_sampler=ProfileSampler(profiles),
+        name_pools=name_pools,
     )
     df_customers.to_csv(OUT_DIR / "customers.csv", index=False)
 
 
-    # SALES
+    # Popularity samplers (built once, shared by all customers)
+    popularity = popularity_settings_from_args(args)
+    product_samplers = build_product_samplers(df_items, popularity)
+    store_sampler = build_store_sampler(STORE_IDS, popularity)
+
+    # Behavior profile tables (built lazily per profile_id; samplers above are shared by all of them)
+    profile_tables = build_profile_tables(
+        profiles,
+        product_samplers=product_samplers,
+        store_ids=store_sampler,
+        stop_invoices_on_lost_day=True,
+    )
+
+    # SALES (customers in customer_id order, written in batches)
+    import pandas as pd
+
     first_write = True
-    for customer_dict in df_customers.to_dict(orient="records"):
-        sales = generate_customer_sales_rows(
-            customer_id=customer_dict["customer_id"],
-            sales_start_date=customer_dict["created_at"],
-            sales_end_date=args.date_till,
-            device_product_ids=df_items[df_items.category=='DEVICE'].product_id.to_list(),
-            refill_product_ids= df_items[df_items.category=='REFILL'].product_id.to_list(),
-            accessory_product_ids=df_items[df_items.category=='ACCESSORY'].product_id.to_list(),
-            spare_part_product_ids=df_items[df_items.category=='SPARE_PART'].product_id.to_list(),
-            store_ids= list(range(101, 110)),
-            p_buy_by_year= random.choice ([
-                [0.05, 0.07, 0.08, 0.09],       # +++
-                [0.04, 0.06, 0.07, 0.08],       # ++
-                [0.02, 0.03, 0.04, 0.06],       # ++
-                [0.01, 0.02, 0.03, 0.04],       # +
-                [0.06, 0.04, 0.03, 0.02],       # -
-                [0.03, 0.02, 0.015, 0.01],      # -
-                [0.01, 0.008, 0.006, 0.004]     # -
-            ]),
-            p_close_day=random.choice([0.0001, 0.0002, 0.0003, 0.0004]),
-            p_invoice_by_nth=random.choice([
-                [1.00, 0.80, 0.50, 0.10],
-                [1.00, 0.15, 0.05, 0.01],
-                [1.00, 0.05, 0.01, 0.00],
-                [1.00, 0.01],
-                [1.00, 0.00],
-            ]),
-            p_device_by_nth=random.choice([
-                [0.99, 0.10, 0.00],
-                [0.90, 0.35, 0.15, 0.01],
-                [0.95, 0.00],
-            ]),
-            refill_count_probs=random.choice([
-                [0.95, 0.80, 0.50, 0.10],
-                [0.90, 0.75, 0.60, 0.30],
-                [0.85, 0.80, 0.20, 0.05],
-                [0.70, 0.30, 0.10, 0.05],
-                [0.60, 0.30, 0.10, 0.05],
-            ]),
-            p_refill_invoice=0.95,
-            p_accessory_invoice=random.choice( [0.08, 0.06, 0.05, 0.03, 0.00]),
-            p_spare_part_invoice=random.choice([0.10, 0.05, 0.03, 0.01, 0.00]),
-            stop_invoices_on_lost_day=True)
-
-        if not sales:
-            continue
-
-        df_chunk = pd.DataFrame.from_records(sales)
+    batch = []
 
+    def flush_sales():
+        nonlocal first_write
+        if not batch:
+            return
         mode = "w" if first_write else "a"
-        df_chunk.to_csv(OUT_DIR / 'sales.csv', mode=mode, index=False, header=first_write)
-
+        pd.DataFrame.from_records(batch).to_csv(OUT_DIR / 'sales.csv', mode=mode, index=False, header=first_write)
         first_write = False
+        batch.clear()
+
+    for sales in generate_sales_rows(
+        customers=zip(
+            df_customers["customer_id"].tolist(),
+            df_customers["created_at"].tolist(),
+            df_customers["profile_id"].tolist(),
+        ),
+        sales_end_date=args.date_till,
+        profile_tables=profile_tables,
+    ):
+        batch.extend(sales)
+        if len(batch) >= SALES_WRITE_BATCH_ROWS:
+            flush_sales()
+    flush_sales()
+
     print('data generation - completed')
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["validate"]:
+        from src.validate import main as validate_main
+        sys.exit(validate_main(sys.argv[2:], default_out_dir=OUT_DIR))
     main()
\ No newline at end of file
@@ -1 +1,11 @@
-from . import items, customers, sales
\ No newline at end of file
+# Submodules are imported on first access, so e.g. `import src.sales` does not pull in
+# pandas/NumPy/Faker through src.items / src.customers.
+import importlib
+
+__all__ = ["items", "customers", "sales", "samplers", "profiles", "settings", "cache", "validate", "api"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
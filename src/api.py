@@ -0,0 +1,349 @@
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+
+from .profiles import SETTINGS_PROFILES, ProfileSampler, build_profile_tables, validate_profiles
+from .sales import simulate_customer_sales_rows
+from .samplers import build_product_samplers, build_store_sampler
+from .settings import SETTINGS_UNIVERSE, STORE_IDS
+
+
+# ==========================================================
+# Size-bounded LRU cache (thread-safe)
+# ==========================================================
+class _LRUCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = int(maxsize)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# ==========================================================
+# Per-customer simulation core (pure Python; also runs in pool workers)
+# - Every random stream is seeded from (seed, customer_id, stream name),
+#   so results do not depend on call order, threads or processes.
+# ==========================================================
+class _SalesState:
+    __slots__ = ("seed", "start_ordinal", "n_days", "date_till", "profile_sampler", "profile_tables")
+
+
+def _customer_core(state: _SalesState, customer_id: int) -> tuple[str, int]:
+    """
+    (created_at, profile_id) for a customer.
+    """
+    rng = random.Random(f"{state.seed}:{customer_id}:customer")
+    created_at = date.fromordinal(state.start_ordinal + rng.randrange(state.n_days + 1)).isoformat()
+    return created_at, state.profile_sampler.draw(rng)
+
+
+def _simulate(state: _SalesState, customer_id: int) -> list[dict]:
+    created_at, profile_id = _customer_core(state, customer_id)
+    return simulate_customer_sales_rows(
+        customer_id=customer_id,
+        sales_start_date=created_at,
+        sales_end_date=state.date_till,
+        tables=state.profile_tables[profile_id],
+        seed=f"{state.seed}:{customer_id}:sales",
+    )
+
+
+_WORKER_STATE = None
+
+
+def _init_worker(state: _SalesState) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = state
+
+
+def _worker_sales(customer_ids: list[int]) -> list[tuple[int, list[dict]]]:
+    return [(cid, _simulate(_WORKER_STATE, cid)) for cid in customer_ids]
+
+
+# ==========================================================
+# Public API
+# ==========================================================
+class SyntheticERP:
+    """
+    On-demand synthetic ERP data for individual customers.
+
+    Configured once (catalog, behavior profiles, seed); customer(id) and sales_for(id)
+    are then generated lazily for just that customer, deterministic per (seed, customer_id),
+    and memoized in a size-bounded LRU cache.
+
+    Parameters:
+      items_df
+        Catalog (output of sample_items_dataset_df or items.csv). None => default catalog
+        sampled with `seed` (same sizes as run.py defaults).
+
+      profiles
+        Behavior profile registry (same shape as SETTINGS_PROFILES["params"]).
+
+      seed
+        Base seed. Same seed + same configuration => same customers and sales.
+
+      date_from / date_till
+        created_at range for customers; sales end date.
+
+      n_customers
+        Optional upper bound for valid customer ids (1..n_customers).
+
+      popularity_settings / store_ids
+        Product/store popularity (see src/samplers.py).
+
+      p_* / faker_locale / name_pools / blank
+        Customer master fields, as in generate_customers_df().
+
+      cache_size
+        Max number of customers kept in each LRU cache (customers, sales).
+
+    Note: cached values are shared; do not mutate returned rows.
+    """
+
+    def __init__(
+        self,
+        *,
+        items_df=None,
+        profiles: dict | None = None,
+        seed: int = 0,
+        date_from: str = "2015-01-01",
+        date_till: str = "2025-12-31",
+        n_customers: int | None = None,
+        popularity_settings: dict = SETTINGS_UNIVERSE["popularity"],
+        store_ids: list[int] = STORE_IDS,
+        faker_locale: str = "en_US",
+        name_pools: dict | None = None,
+        p_first_name: float = 0.90,
+        p_last_name: float = 0.60,
+        p_email: float = 0.70,
+        p_phone: float = 0.80,
+        p_email_opt_in: float = 0.60,
+        p_sms_opt_in: float = 0.90,
+        p_call_opt_in: float = 0.75,
+        blank: str = "",
+        cache_size: int = 10_000,
+    ):
+        start = date.fromisoformat(date_from)
+        end = date.fromisoformat(date_till)
+        if start > end:
+            raise ValueError("date_from must be <= date_till.")
+
+        if items_df is None:
+            from .items import build_items_universe_df, sample_items_dataset_df
+
+            items_df = sample_items_dataset_df(
+                build_items_universe_df(),
+                n_devices=5,
+                n_accessories=10,
+                n_spare_parts=8,
+                n_refills=74,
+                n_bulk_refills=1,
+                seed=seed,
+            )
+        self.items_df = items_df
+
+        self.profiles = validate_profiles(profiles if profiles is not None else SETTINGS_PROFILES["params"])
+        self.seed = seed
+        self.n_customers = n_customers
+
+        state = _SalesState()
+        state.seed = seed
+        state.start_ordinal = start.toordinal()
+        state.n_days = (end - start).days
+        state.date_till = end.isoformat()
+        state.profile_sampler = ProfileSampler(self.profiles)
+        state.profile_tables = build_profile_tables(
+            self.profiles,
+            product_samplers=build_product_samplers(items_df, popularity_settings, seed=seed),
+            store_ids=build_store_sampler(list(store_ids), popularity_settings),
+        )
+        self._state = state
+
+        self.faker_locale = faker_locale
+        self._name_pools = name_pools
+        self._customer_probs = {
+            "p_first_name": float(p_first_name),
+            "p_last_name": float(p_last_name),
+            "p_email": float(p_email),
+            "p_phone": float(p_phone),
+            "p_email_opt_in": float(p_email_opt_in),
+            "p_sms_opt_in": float(p_sms_opt_in),
+            "p_call_opt_in": float(p_call_opt_in),
+        }
+        self.blank = blank
+        self._faker = threading.local()
+        self._lock = threading.Lock()
+
+        self._customers = _LRUCache(cache_size)
+        self._sales = _LRUCache(cache_size)
+
+    # ------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------
+    def _check_id(self, customer_id) -> int:
+        cid = int(customer_id)
+        if cid < 1 or (self.n_customers is not None and cid > self.n_customers):
+            raise ValueError(f"customer_id {customer_id} is out of range.")
+        return cid
+
+    def _get_name_pools(self) -> dict:
+        if self._name_pools is None:
+            with self._lock:
+                if self._name_pools is None:
+                    from .customers import build_name_pools
+
+                    self._name_pools = build_name_pools(self.faker_locale, seed=self.seed)
+        return self._name_pools
+
+    def _get_faker(self):
+        # Faker instances are not thread-safe once re-seeded => one per thread
+        fake = getattr(self._faker, "fake", None)
+        if fake is None:
+            from faker import Faker
+
+            fake = self._faker.fake = Faker(self.faker_locale)
+        return fake
+
+    # ------------------------------------------------------
+    # Customers
+    # ------------------------------------------------------
+    def customer(self, customer_id: int) -> dict:
+        """
+        Customer master record (same columns as customers.csv).
+        """
+        cid = self._check_id(customer_id)
+        cached = self._customers.get(cid)
+        if cached is not None:
+            return cached
+
+        created_at, profile_id = _customer_core(self._state, cid)
+        p = self._customer_probs
+        blank = self.blank
+        rng = random.Random(f"{self.seed}:{cid}:contact")
+        pools = self._get_name_pools()
+
+        first_name = pools["first_name"][rng.randrange(len(pools["first_name"]))] if rng.random() < p["p_first_name"] else blank
+        last_name = pools["last_name"][rng.randrange(len(pools["last_name"]))] if rng.random() < p["p_last_name"] else blank
+        has_email = rng.random() < p["p_email"]
+        has_phone = rng.random() < p["p_phone"]
+
+        email = phone = blank
+        if has_email or has_phone:
+            fake = self._get_faker()
+            fake.seed_instance(f"{self.seed}:{cid}:faker")
+            if has_email:
+                email = fake.email()
+            if has_phone:
+                phone = fake.phone_number()
+
+        # Opt-ins: only possible if contact exists; otherwise forced 0
+        record = {
+            "customer_id": cid,
+            "created_at": created_at,
+            "first_name": str(first_name),
+            "last_name": str(last_name),
+            "email": email,
+            "phone": phone,
+            "email_opt_in": int(has_email and rng.random() < p["p_email_opt_in"]),
+            "sms_opt_in": int(has_phone and rng.random() < p["p_sms_opt_in"]),
+            "call_opt_in": int(has_phone and rng.random() < p["p_call_opt_in"]),
+            "profile_id": profile_id,
+        }
+        self._customers.put(cid, record)
+        return record
+
+    # ------------------------------------------------------
+    # Sales
+    # ------------------------------------------------------
+    def sales_for(self, customer_id: int) -> list[dict]:
+        """
+        Sales lines of one customer (same columns as sales.csv).
+        """
+        cid = self._check_id(customer_id)
+        cached = self._sales.get(cid)
+        if cached is not None:
+            return cached
+
+        rows = _simulate(self._state, cid)
+        self._sales.put(cid, rows)
+        return rows
+
+    def sales_for_many(
+        self,
+        customer_ids,
+        *,
+        executor: str = "thread",
+        max_workers: int | None = None,
+        chunk_size: int = 256,
+    ) -> dict[int, list[dict]]:
+        """
+        Sales lines for many customers: {customer_id: rows}.
+
+        executor
+          "thread"  => ThreadPoolExecutor (no start-up cost; simulation is pure Python, so little parallel speedup)
+          "process" => ProcessPoolExecutor (true parallelism; workers get only the sales tables,
+                       no pandas/Faker work happens in them)
+
+        Cached customers are served from the LRU cache; the rest are generated and cached.
+        """
+        ids = [self._check_id(c) for c in customer_ids]
+        out = {}
+        todo = []
+        for cid in dict.fromkeys(ids):
+            cached = self._sales.get(cid)
+            if cached is not None:
+                out[cid] = cached
+            else:
+                todo.append(cid)
+
+        chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+        if executor == "thread":
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                results = ex.map(lambda chunk: [(cid, _simulate(self._state, cid)) for cid in chunk], chunks)
+                for pairs in results:
+                    for cid, rows in pairs:
+                        self._sales.put(cid, rows)
+                        out[cid] = rows
+        elif executor == "process":
+            if chunks:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_worker,
+                    initargs=(self._state,),
+                ) as ex:
+                    for pairs in ex.map(_worker_sales, chunks):
+                        for cid, rows in pairs:
+                            self._sales.put(cid, rows)
+                            out[cid] = rows
+        else:
+            raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}.")
+
+        return {cid: out[cid] for cid in ids}
+
+    def clear_cache(self) -> None:
+        self._customers.clear()
+        self._sales.clear()
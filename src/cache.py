@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from importlib import metadata
+from pathlib import Path
+
+
+# ==========================================================
+# CACHE SETTINGS
+# - Artifacts are stored as uncompressed .npz (plain arrays, no pickle)
+# - Bump CACHE_VERSION when the layout of a cached artifact changes
+# ==========================================================
+CACHE_VERSION = 1
+CACHE_DIR = Path(".cache")
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# File names owned by the cache: entries <name>-<32 hex key>.npz, temp files of in-progress saves
+ENTRY_NAME = re.compile(r"[A-Za-z0-9_]+-[0-9a-f]{32}\.npz")
+TMP_PREFIX = "artifact-"
+TMP_MAX_AGE_S = 3600  # older temp files are leftovers of interrupted saves (a live save is much faster)
+
+# Library versions are part of every key (Faker data / NumPy formats may change between releases)
+KEY_LIBRARIES = ("numpy", "pandas", "Faker")
+
+
+def _library_versions() -> dict:
+    out = {"python": "%d.%d" % sys.version_info[:2]}
+    for lib in KEY_LIBRARIES:
+        try:
+            out[lib] = metadata.version(lib)
+        except metadata.PackageNotFoundError:
+            out[lib] = "missing"
+    return out
+
+
+class ArtifactCache:
+    """
+    Local on-disk cache for precomputed arrays (item universe, name pools, ...).
+
+    Parameters:
+      cache_dir
+        Directory holding <name>-<key>.npz files (created on first write).
+
+      max_bytes
+        Size cap for the whole directory. Least recently used entries are evicted first
+        (a cache hit refreshes the entry's mtime).
+
+      enabled
+        False => every get_or_build() call just builds (same as --no-cache).
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, *, max_bytes: int = CACHE_MAX_BYTES, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.enabled = bool(enabled)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Stable hash of JSON-serializable parts (settings dicts, locale, sizes, ...) + library versions.
+        """
+        payload = json.dumps(
+            {"version": CACHE_VERSION, "libs": _library_versions(), "parts": parts},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, name: str, key: str) -> Path:
+        return self.cache_dir / f"{name}-{key}.npz"
+
+    def load(self, name: str, key: str) -> dict | None:
+        import numpy as np
+
+        path = self._path(name, key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {k: npz[k] for k in npz.files}
+            os.utime(path)  # LRU: mark as recently used
+        except FileNotFoundError:
+            # Missing, or evicted by a concurrent run => miss
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # Unreadable (e.g. truncated) entry => drop it and treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+        return arrays
+
+    def save(self, name: str, key: str, arrays: dict) -> None:
+        import numpy as np
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(name, key)
+
+        # Write to a temp file + rename, so concurrent runs never read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=TMP_PREFIX, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self.evict(keep=path)
+
+    def evict(self, keep: Path | None = None) -> None:
+        """
+        Delete least recently used entries until the directory fits into max_bytes.
+
+        Only this cache's own files are touched (<name>-<key>.npz entries and temp files of
+        interrupted saves older than TMP_MAX_AGE_S), never other files in cache_dir.
+        """
+        now = time.time()
+        for p in self.cache_dir.glob(f"{TMP_PREFIX}*.tmp"):
+            try:
+                if now - p.stat().st_mtime > TMP_MAX_AGE_S:
+                    p.unlink(missing_ok=True)
+            except OSError:
+                continue
+
+        entries = []
+        for p in self.cache_dir.glob("*.npz"):
+            if not ENTRY_NAME.fullmatch(p.name):
+                continue
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def get_or_build(self, name: str, key_parts, build, *, to_arrays, from_arrays):
+        """
+        Return the artifact `name` for key_parts: from disk if cached, otherwise build() and store it.
+
+        build()             -> artifact
+        to_arrays(artifact) -> {str: np.ndarray}   (no object arrays)
+        from_arrays(arrays) -> artifact
+        """
+        if not self.enabled:
+            return build()
+
+        key = self.key(name, key_parts)
+        arrays = self.load(name, key)
+        if arrays is not None:
+            return from_arrays(arrays)
+
+        artifact = build()
+        self.save(name, key, to_arrays(artifact))
+        return artifact
@@ -4,6 +4,31 @@ from faker import Faker
 from datetime import date
 
 
+# Names generated once per locale and then sampled (see build_name_pools)
+NAME_POOL_SIZE = 2000
+
+
+def build_name_pools(faker_locale: str, pool_size: int = NAME_POOL_SIZE, seed: int | None = None) -> dict:
+    """
+    Pools of Faker first/last names for vectorized sampling.
+
+    Output:
+      {"first_name": np.ndarray[str], "last_name": np.ndarray[str]}
+
+    Names are drawn from Faker's own weighted lists, so sampling uniformly from a pool
+    keeps Faker's name frequencies. Plain str arrays => cacheable (see src/cache.py).
+    seed: optional seed for reproducible pools.
+    """
+    fake = Faker(faker_locale)
+    if seed is not None:
+        fake.seed_instance(seed)
+    n = int(pool_size)
+    return {
+        "first_name": np.array([fake.first_name() for _ in range(n)], dtype=str),
+        "last_name": np.array([fake.last_name() for _ in range(n)], dtype=str),
+    }
+
+
 def generate_customers_df(
     *,
     faker_locale: str,
@@ -18,6 +43,8 @@ def generate_customers_df(
     p_sms_opt_in: float,               # applied ONLY when phone is present
     p_call_opt_in: float,              # applied ONLY when phone is present
     blank: str = "",
+    profile_sampler=None,
+    name_pools: dict | None = None,
 ) -> pd.DataFrame:
     """
     Generate customers master dataset.
@@ -32,6 +59,11 @@ def generate_customers_df(
       email_opt_in (0/1)          If email missing => 0
       sms_opt_in (0/1)            If phone missing => 0
       call_opt_in (0/1)           If phone missing => 0
+      profile_id (int)            Only if profile_sampler is given: behavior profile id
+                                  (ProfileSampler, see src/profiles.py)
+
+    name_pools: output of build_name_pools(); if given, first/last names are sampled
+    from the pools in one vectorized draw instead of one Faker call per customer.
     """
     n = int(n_customers)
     rng = np.random.default_rng()
@@ -53,8 +85,20 @@ def generate_customers_df(
             out[mask] = [gen_func() for _ in range(k)]
         return out, mask
 
-    first_name, _ = gen_optional_strings(p_first_name, fake.first_name)
-    last_name, _ = gen_optional_strings(p_last_name, fake.last_name)
+    def gen_optional_from_pool(p, pool):
+        mask = rng.random(n) < float(p)
+        out = np.full(n, blank, dtype=object)
+        k = int(mask.sum())
+        if k > 0:
+            out[mask] = pool[rng.integers(0, len(pool), size=k)]
+        return out, mask
+
+    if name_pools is not None:
+        first_name, _ = gen_optional_from_pool(p_first_name, name_pools["first_name"])
+        last_name, _ = gen_optional_from_pool(p_last_name, name_pools["last_name"])
+    else:
+        first_name, _ = gen_optional_strings(p_first_name, fake.first_name)
+        last_name, _ = gen_optional_strings(p_last_name, fake.last_name)
     email, email_mask = gen_optional_strings(p_email, fake.email)
     phone, phone_mask = gen_optional_strings(p_phone, fake.phone_number)
 
@@ -70,7 +114,7 @@ def generate_customers_df(
         sms_opt_in_arr[phone_mask] = (rng.random(m) < float(p_sms_opt_in)).astype(np.int8)
         call_opt_in_arr[phone_mask] = (rng.random(m) < float(p_call_opt_in)).astype(np.int8)
 
-    df = pd.DataFrame({
+    columns = {
         "created_at": created_at.astype(str),  # ISO YYYY-MM-DD
         "first_name": first_name,
         "last_name": last_name,
@@ -79,7 +123,13 @@ def generate_customers_df(
         "email_opt_in": email_opt_in_arr,
         "sms_opt_in": sms_opt_in_arr,
         "call_opt_in": call_opt_in_arr,
-    })
+    }
+
+    # Behavior profile: one vectorized weighted draw per profile parameter for all customers
+    if profile_sampler is not None:
+        columns["profile_id"] = profile_sampler.draw_many(n, rng)
+
+    df = pd.DataFrame(columns)
 
     # Sort by created_at, then assign sequential customer_id starting at 1
     df = df.sort_values("created_at", kind="mergesort").reset_index(drop=True)
@@ -1,111 +1,31 @@
 # src/generate_items.py
-import random
+import numpy as np
 import pandas as pd
 
+# Settings live in src/settings.py (importable without pandas/NumPy); re-exported here
+from .settings import SETTINGS_PRICING, SETTINGS_UNIVERSE
+
 
 # ==========================================================
-# UNIVERSE SETTINGS
-# - Defines the FULL possible catalog space (all combinations)
+# 1) Build FULL universe
 # ==========================================================
-SETTINGS_UNIVERSE = {
-    # Brands
-    "device_brands": ["AromaDrive", "BreezeLine", "FreshNest"],
-    "refill_brands": ["Good Smell", "AromaWave", "FreshNest", "Citrus & Co", "BreezeLine"],
-
-    # Devices (templates)
-    "devices_catalog": [
-        "Diffuser Machine - Home",
-        "Diffuser Machine - Compact",
-        "Nebulizer Machine - Pro",
-        "Car Diffuser Machine - Clip",
-        "Car Diffuser Machine - Mini",
-    ],
-
-    # Accessories (templates)
-    "accessories_catalog": [
-        "Wall Bracket Mount",
-        "Hanging Strap",
-        "Decor Sticker Pack",
-        "Protective Sleeve",
-        "Travel Pouch",
-        "Cable Organizer Clip",
-        "Adhesive Mount Pad",
-        "Car Vent Holder",
-        "Desk Stand Base",
-        "Cleaning Wipes Pack",
-    ],
-
-    # Spare parts (templates)
-    "spare_parts_catalog": [
-        "Replacement Cap",
-        "Nozzle Holder",
-        "Scent Cartridge Holder",
-        "Seal Ring (O-Ring)",
-        "Diffuser Wick Set",
-        "Power Adapter",
-        "USB Cable",
-        "Clip Replacement",
-    ],
-
-    # Regular refill combinations (cross product)
-    "scents": ["Citrus", "Lavender", "Coffee", "Vanilla", "Ocean", "Jasmine", "Rose", "Mint", "Pine", "Chocolate"],
-    "refill_sizes_g": [10, 20, 30, 50, 100],
-
-    # Bulk refills: special industrial items
-    "bulk_refills": [
-        {"brand": "Good Smell", "scent": "Citrus",   "gramm_g": 500,  "suffix": "(Industrial)"},
-        {"brand": "AromaWave",  "scent": "Lavender", "gramm_g": 500,  "suffix": "(Industrial)"},
-        {"brand": "FreshNest",  "scent": "Coffee",   "gramm_g": 1000, "suffix": "(Industrial)"},
-    ],
-}
+def _cross_index(*sizes: int) -> list[np.ndarray]:
+    """
+    Cartesian product as index arrays (first axis varies slowest, like nested loops).
+    """
+    grids = np.meshgrid(*[np.arange(n, dtype=np.int64) for n in sizes], indexing="ij")
+    return [g.ravel() for g in grids]
 
 
-# ==========================================================
-# PRICING SETTINGS
-# - Simple hardcoded model with tunable knobs
-# ==========================================================
-SETTINGS_PRICING = {
-    # Category base price ranges (currency-agnostic)
-    # We will sample from these ranges and then apply brand/gramm adjustments + noise.
-    "base_ranges": {
-        "DEVICE": (180.0, 650.0),
-        "ACCESSORY": (12.0, 75.0),
-        "SPARE_PART": (18.0, 140.0),
-        "REFILL": (8.0, 30.0),  # base component for refills (final comes from gramm model)
-    },
-
-    # Brand multipliers (premium/eco)
-    # Brands not listed => 1.0
-    "brand_multiplier": {
-        "FreshNest": 1.10,
-        "AromaDrive": 1.05,
-        "BreezeLine": 1.00,
-        "Good Smell": 0.95,
-        "AromaWave": 1.00,
-        "Citrus & Co": 0.90,
-    },
-
-    # Refill price per gram model:
-    # - for small refills (10..100g): use price_per_g_small
-    # - for bulk refills (>= 500g): use price_per_g_bulk (cheaper per gram)
-    "price_per_g_small": 0.55,   # e.g. 50g => 27.5
-    "price_per_g_bulk": 0.22,    # e.g. 500g => 110
-
-    # Extra fixed packaging margin for refills
-    "refill_packaging_fee_small": 3.0,
-    "refill_packaging_fee_bulk": 12.0,
-
-    # Noise (applied multiplicatively)
-    "noise_pct": 0.08,  # ±8%
-
-    # Rounding
-    "round_to": 0.5,  # round to 0.5 increments (e.g., 12.0, 12.5, 13.0)
-}
+def _obj(values) -> np.ndarray:
+    out = np.empty(len(values), dtype=object)
+    out[:] = list(values)
+    return out
+
+
+CATEGORIES = ["DEVICE", "ACCESSORY", "SPARE_PART", "REFILL"]
 
 
-# ==========================================================
-# 1) Build FULL universe
-# ==========================================================
 def build_items_universe_df(universe_settings: dict = SETTINGS_UNIVERSE) -> pd.DataFrame:
     """
     Build the FULL catalog space (all possible combinations).
@@ -115,132 +35,204 @@ def build_items_universe_df(universe_settings: dict = SETTINGS_UNIVERSE) -> pd.D
 
     Internal helper column:
       _is_bulk (0/1)  -> used only for sampling logic
+
+    Rows are produced with cartesian-product index arrays (no per-row Python loop);
+    brand/category are categoricals, so 1M+ row universes build in a fraction of a second.
     """
-    rows = []
-
-    # Devices: device_brand x device_template
-    for brand in universe_settings["device_brands"]:
-        for device_name in universe_settings["devices_catalog"]:
-            rows.append({
-                "product_name": f"{brand} {device_name}",
-                "brand": brand,
-                "category": "DEVICE",
-                "gramm_g": "",
-                "_is_bulk": 0,
-            })
-
-    # Accessories: device_brand x accessory_template
-    for brand in universe_settings["device_brands"]:
-        for name in universe_settings["accessories_catalog"]:
-            rows.append({
-                "product_name": f"{brand} {name}",
-                "brand": brand,
-                "category": "ACCESSORY",
-                "gramm_g": "",
-                "_is_bulk": 0,
-            })
-
-    # Spare parts: device_brand x spare_part_template
-    for brand in universe_settings["device_brands"]:
-        for name in universe_settings["spare_parts_catalog"]:
-            rows.append({
-                "product_name": f"{brand} {name}",
-                "brand": brand,
-                "category": "SPARE_PART",
-                "gramm_g": "",
-                "_is_bulk": 0,
-            })
+    bulk = universe_settings.get("bulk_refills", [])
+    device_brands = list(universe_settings["device_brands"])
+    refill_brands = list(universe_settings["refill_brands"])
+    all_brands = list(dict.fromkeys(device_brands + refill_brands + [br["brand"] for br in bulk]))
+    brand_code = {b: i for i, b in enumerate(all_brands)}
+
+    names, brand_codes, category_codes, gramms, bulk_flags = [], [], [], [], []
+
+    def add_block(name_arr, brand_code_arr, category, gramm_arr, is_bulk):
+        n = len(name_arr)
+        names.append(name_arr)
+        brand_codes.append(brand_code_arr)
+        category_codes.append(np.full(n, CATEGORIES.index(category), dtype=np.int8))
+        gramms.append(gramm_arr)
+        bulk_flags.append(np.full(n, is_bulk, dtype=np.int8))
+
+    # Devices / accessories / spare parts: device_brand x template
+    device_codes = np.array([brand_code[b] for b in device_brands], dtype=np.int32)
+    device_prefixes = _obj([f"{b} " for b in device_brands])
+    for category, key in (
+        ("DEVICE", "devices_catalog"),
+        ("ACCESSORY", "accessories_catalog"),
+        ("SPARE_PART", "spare_parts_catalog"),
+    ):
+        templates = list(universe_settings[key])
+        bi, ti = _cross_index(len(device_brands), len(templates))
+        add_block(device_prefixes[bi] + _obj(templates)[ti], device_codes[bi], category, _obj([""] * len(bi)), 0)
 
     # Regular refills: refill_brand x scent x size
-    for brand in universe_settings["refill_brands"]:
-        for scent in universe_settings["scents"]:
-            for g in universe_settings["refill_sizes_g"]:
-                rows.append({
-                    "product_name": f"{brand} Refill Liquid {scent} {int(g)}",
-                    "brand": brand,
-                    "category": "REFILL",
-                    "gramm_g": int(g),
-                    "_is_bulk": 0,
-                })
+    scents = list(universe_settings["scents"])
+    sizes = [int(g) for g in universe_settings["refill_sizes_g"]]
+    bi, si, gi = _cross_index(len(refill_brands), len(scents), len(sizes))
+    # "<brand> Refill Liquid <scent> " prefix per (brand, scent) pair, then one concat per row
+    prefixes = _obj([f"{b} Refill Liquid {sc} " for b in refill_brands for sc in scents])
+    refill_codes = np.array([brand_code[b] for b in refill_brands], dtype=np.int32)
+    add_block(
+        prefixes[bi * len(scents) + si] + _obj([str(g) for g in sizes])[gi],
+        refill_codes[bi],
+        "REFILL",
+        _obj(sizes)[gi],
+        0,
+    )
 
     # Bulk refills: explicit list
-    for br in universe_settings.get("bulk_refills", []):
-        brand = br["brand"]
-        scent = br["scent"]
-        gramm = int(br["gramm_g"])
+    bulk_names = []
+    for br in bulk:
         suffix = br.get("suffix", "").strip()
         suffix_part = f" {suffix}" if suffix else ""
-        rows.append({
-            "product_name": f"{brand} Refill Liquid {scent} {gramm}{suffix_part}",
-            "brand": brand,
-            "category": "REFILL",
-            "gramm_g": gramm,
-            "_is_bulk": 1,
-        })
-
-    return pd.DataFrame(rows)
+        bulk_names.append(f"{br['brand']} Refill Liquid {br['scent']} {int(br['gramm_g'])}{suffix_part}")
+    add_block(
+        _obj(bulk_names),
+        np.array([brand_code[br["brand"]] for br in bulk], dtype=np.int32),
+        "REFILL",
+        _obj([int(br["gramm_g"]) for br in bulk]),
+        1,
+    )
+
+    return pd.DataFrame({
+        "product_name": np.concatenate(names),
+        "brand": pd.Categorical.from_codes(np.concatenate(brand_codes), categories=all_brands),
+        "category": pd.Categorical.from_codes(np.concatenate(category_codes), categories=CATEGORIES),
+        "gramm_g": np.concatenate(gramms),
+        "_is_bulk": np.concatenate(bulk_flags),
+    })
+
+
+def universe_to_arrays(universe_df: pd.DataFrame) -> dict:
+    """
+    Universe as plain NumPy arrays (cache format, see src/cache.py).
+    gramm_g "" is stored as -1.
+    """
+    brand = pd.Categorical(universe_df["brand"])
+    category = pd.Categorical(universe_df["category"], categories=CATEGORIES)
+    gramm = universe_df["gramm_g"].to_numpy(dtype=object)
+    gramm = np.where(gramm == "", -1, gramm).astype(np.int32)
+    return {
+        "product_name": universe_df["product_name"].to_numpy(dtype=str),
+        "brand_codes": brand.codes,
+        "brand_categories": np.asarray(brand.categories, dtype=str),
+        "category_codes": category.codes,
+        "gramm_g": gramm,
+        "_is_bulk": universe_df["_is_bulk"].to_numpy(dtype=np.int8),
+    }
+
+
+def universe_from_arrays(arrays: dict) -> pd.DataFrame:
+    """
+    Inverse of universe_to_arrays().
+    """
+    gramm = arrays["gramm_g"]
+    gramm_obj = _obj(gramm.tolist())
+    gramm_obj[gramm < 0] = ""
+    return pd.DataFrame({
+        "product_name": arrays["product_name"].astype(object),
+        "brand": pd.Categorical.from_codes(arrays["brand_codes"], categories=arrays["brand_categories"].tolist()),
+        "category": pd.Categorical.from_codes(arrays["category_codes"], categories=CATEGORIES),
+        "gramm_g": gramm_obj,
+        "_is_bulk": arrays["_is_bulk"],
+    })
 
 
 # ==========================================================
 # Pricing helpers
 # ==========================================================
-def _round_to_step(x: float, step: float) -> float:
+def _round_to_step(x: np.ndarray, step: float) -> np.ndarray:
     if step <= 0:
-        return float(x)
-    return round(float(x) / step) * step
-
+        return x.astype(float)
+    return np.round(x / step) * step
 
-def _brand_mult(pricing_settings: dict, brand: str) -> float:
-    m = pricing_settings.get("brand_multiplier", {})
-    return float(m.get(brand, 1.0))
 
-
-def _price_for_row(rng: random.Random, row: dict, pricing_settings: dict) -> float:
+def _prices(rng: np.random.Generator, df: pd.DataFrame, pricing_settings: dict) -> np.ndarray:
     """
-    Hardcoded price model:
+    Hardcoded price model (vectorized over whole category arrays):
       - DEVICE/ACCESSORY/SPARE_PART: sample base range * brand_multiplier * noise
       - REFILL: gramm-based (small vs bulk) + packaging fee * brand_multiplier * noise
     """
-    cat = row["category"]
-    brand = row["brand"]
+    n = len(df)
+    category = df["category"].to_numpy()
 
     base_ranges = pricing_settings["base_ranges"]
     noise_pct = float(pricing_settings["noise_pct"])
     step = float(pricing_settings["round_to"])
-    bm = _brand_mult(pricing_settings, brand)
+    bm = df["brand"].map(pricing_settings.get("brand_multiplier", {})).fillna(1.0).to_numpy(dtype=float)
 
     # noise factor in [1-noise, 1+noise]
-    noise = 1.0 + rng.uniform(-noise_pct, noise_pct)
+    noise = 1.0 + rng.uniform(-noise_pct, noise_pct, size=n)
+
+    # Fallback (should not happen): unknown categories, not clamped to step
+    price = _round_to_step(10.0 * bm * noise, step)
 
-    if cat in ("DEVICE", "ACCESSORY", "SPARE_PART"):
+    for cat in ("DEVICE", "ACCESSORY", "SPARE_PART"):
+        m = category == cat
+        k = int(m.sum())
+        if not k:
+            continue
         lo, hi = base_ranges[cat]
-        base = rng.uniform(float(lo), float(hi))
-        price = base * bm * noise
-        return max(step, _round_to_step(price, step))
+        base = rng.uniform(float(lo), float(hi), size=k)
+        price[m] = np.maximum(step, _round_to_step(base * bm[m] * noise[m], step))
 
-    if cat == "REFILL":
-        gramm = row.get("gramm_g", "")
-        gramm_int = int(gramm) if gramm != "" else 0
+    m = category == "REFILL"
+    if m.any():
+        gramm = pd.to_numeric(df["gramm_g"].to_numpy()[m], errors="coerce")
+        gramm = np.nan_to_num(np.asarray(gramm, dtype=float), nan=0.0).astype(np.int64)
 
         # Determine small vs bulk by gramm
-        if gramm_int >= 500:
-            ppg = float(pricing_settings["price_per_g_bulk"])
-            fee = float(pricing_settings["refill_packaging_fee_bulk"])
-        else:
-            ppg = float(pricing_settings["price_per_g_small"])
-            fee = float(pricing_settings["refill_packaging_fee_small"])
+        is_bulk = gramm >= 500
+        ppg = np.where(is_bulk, float(pricing_settings["price_per_g_bulk"]), float(pricing_settings["price_per_g_small"]))
+        fee = np.where(is_bulk, float(pricing_settings["refill_packaging_fee_bulk"]), float(pricing_settings["refill_packaging_fee_small"]))
 
-        base = (gramm_int * ppg) + fee
-        price = base * bm * noise
-        return max(step, _round_to_step(price, step))
+        base = (gramm * ppg) + fee
+        price[m] = np.maximum(step, _round_to_step(base * bm[m] * noise[m], step))
 
-    # Fallback (should not happen)
-    return _round_to_step(10.0 * bm * noise, step)
+    return price
 
 
 # ==========================================================
 # 2) Sample a dataset from universe (explicit parameters)
 # ==========================================================
+def _pick_refills_by_brand(rng: np.random.Generator, pool_idx: np.ndarray, brand: pd.Series, n_refills: int) -> np.ndarray:
+    """
+    Distribute n_refills evenly across refill brands (sorted by name, remainder to the first ones).
+    Within a brand: no replacement, unless the quota exceeds the brand pool.
+    Returns universe row positions.
+    """
+    codes, uniques = pd.factorize(brand)
+    # Re-number brand codes in sorted-name order
+    sorted_rank = np.empty(len(uniques), dtype=np.int64)
+    sorted_rank[np.argsort(np.asarray(uniques, dtype=str))] = np.arange(len(uniques))
+    # Smallest int dtype => stable argsort below runs as a radix sort
+    codes = sorted_rank[codes].astype(np.min_scalar_type(len(uniques)))
+
+    n_brands = len(uniques)
+    quotas = np.full(n_brands, n_refills // n_brands, dtype=np.int64)
+    quotas[: n_refills % n_brands] += 1
+    sizes = np.bincount(codes, minlength=n_brands)
+    oversubscribed = quotas > sizes
+
+    # Random order within each brand (shuffle, then stable sort by brand),
+    # then take the first `quota` rows of every brand
+    perm = rng.permutation(len(codes))
+    order = perm[np.argsort(codes[perm], kind="stable")]
+    sorted_codes = codes[order]
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(len(order)) - starts[sorted_codes]
+    take = rank < np.where(oversubscribed, 0, quotas)[sorted_codes]
+    picks = [pool_idx[order[take]]]
+
+    # Rare: brand pool smaller than its quota => sample that brand with replacement
+    for b in np.flatnonzero(oversubscribed):
+        picks.append(rng.choice(pool_idx[codes == b], size=int(quotas[b]), replace=True))
+
+    return np.concatenate(picks)
+
+
 def sample_items_dataset_df(
     universe_df: pd.DataFrame,
     *,
@@ -250,6 +242,7 @@ def sample_items_dataset_df(
     n_refills: int,
     n_bulk_refills: int,
     pricing_settings: dict = SETTINGS_PRICING,
+    seed: int | None = None,
 ) -> pd.DataFrame:
     """
     Sample an items dataset from the FULL universe.
@@ -270,10 +263,13 @@ def sample_items_dataset_df(
       pricing_settings
         Price model knobs (base ranges, brand multipliers, gramm pricing, noise, rounding).
 
+      seed
+        Optional seed for a reproducible catalog (None => fresh randomness).
+
     Output columns:
       product_id, product_name, brand, category, gramm_g, unit_price
     """
-    rng = random.Random()
+    rng = np.random.default_rng(seed)
 
     n_devices = int(n_devices)
     n_accessories = int(n_accessories)
@@ -284,13 +280,17 @@ def sample_items_dataset_df(
     if n_devices < 0 or n_accessories < 0 or n_spare_parts < 0 or n_refills < 0 or n_bulk_refills < 0:
         raise ValueError("All n_* parameters must be >= 0.")
 
-    # Pools
-    devices_pool = universe_df[universe_df["category"] == "DEVICE"].copy()
-    accessories_pool = universe_df[universe_df["category"] == "ACCESSORY"].copy()
-    spare_pool = universe_df[universe_df["category"] == "SPARE_PART"].copy()
+    # Pools (row positions in universe_df)
+    category = universe_df["category"]
+    is_bulk = (universe_df["_is_bulk"] == 1).to_numpy()
+    is_refill = (category == "REFILL").to_numpy()
+
+    devices_pool = np.flatnonzero((category == "DEVICE").to_numpy())
+    accessories_pool = np.flatnonzero((category == "ACCESSORY").to_numpy())
+    spare_pool = np.flatnonzero((category == "SPARE_PART").to_numpy())
 
-    refills_pool = universe_df[(universe_df["category"] == "REFILL") & (universe_df["_is_bulk"] == 0)].copy()
-    bulk_pool = universe_df[(universe_df["category"] == "REFILL") & (universe_df["_is_bulk"] == 1)].copy()
+    refills_pool = np.flatnonzero(is_refill & ~is_bulk)
+    bulk_pool = np.flatnonzero(is_refill & is_bulk)
 
     # Sanity checks
     if len(devices_pool) < n_devices:
@@ -304,56 +304,30 @@ def sample_items_dataset_df(
     if len(bulk_pool) < n_bulk_refills:
         raise ValueError(f"Universe has {len(bulk_pool)} bulk REFILL rows, requested n_bulk_refills={n_bulk_refills}.")
 
-    # Sample fixed categories (no replacement)
-    devices_pick = devices_pool.sample(n=n_devices, replace=False) if n_devices else devices_pool.iloc[0:0]
-    accessories_pick = accessories_pool.sample(n=n_accessories, replace=False) if n_accessories else accessories_pool.iloc[0:0]
-    spare_pick = spare_pool.sample(n=n_spare_parts, replace=False) if n_spare_parts else spare_pool.iloc[0:0]
-
-    # Bulk pick: exactly N bulk refills
-    bulk_pick = bulk_pool.sample(n=n_bulk_refills, replace=False) if n_bulk_refills else bulk_pool.iloc[0:0]
+    # Sample fixed categories (no replacement); bulk pick: exactly N bulk refills
+    picks = [
+        rng.choice(devices_pool, size=n_devices, replace=False),
+        rng.choice(accessories_pool, size=n_accessories, replace=False),
+        rng.choice(spare_pool, size=n_spare_parts, replace=False),
+        rng.choice(bulk_pool, size=n_bulk_refills, replace=False),
+    ]
 
     # Regular refills: distribute across refill brands (business-like)
-    refill_picks = []
     if n_refills:
-        refill_brands = sorted(refills_pool["brand"].unique().tolist())
-        base = n_refills // len(refill_brands)
-        remainder = n_refills % len(refill_brands)
-
-        quotas = {b: base for b in refill_brands}
-        for b in refill_brands[:remainder]:
-            quotas[b] += 1
-
-        for brand, qty in quotas.items():
-            if qty <= 0:
-                continue
-            brand_pool = refills_pool[refills_pool["brand"] == brand]
-            replace = qty > len(brand_pool)
-            refill_picks.append(brand_pool.sample(n=qty, replace=replace))
-
-    refills_pick = pd.concat(refill_picks, ignore_index=True) if refill_picks else refills_pool.iloc[0:0]
-
-    # Combine
-    df = pd.concat([devices_pick, accessories_pick, spare_pick, bulk_pick, refills_pick], ignore_index=True)
-
-    # Mix order + assign product_id sequential after mixing
-    rows = df.to_dict("records")
-    rng.shuffle(rows)
+        brand = universe_df["brand"].take(refills_pool)
+        picks.append(_pick_refills_by_brand(rng, refills_pool, brand, n_refills))
 
-    out_rows = []
-    for r in rows:
-        # Ensure gramm_g is int or ""
-        if r.get("gramm_g", "") != "":
-            r["gramm_g"] = int(r["gramm_g"])
-        else:
-            r["gramm_g"] = ""
+    # Combine + mix order, then assign product_id sequential after mixing
+    idx = np.concatenate(picks).astype(np.int64)
+    idx = idx[rng.permutation(len(idx))]
 
-        # Add price on sampling stage
-        r["unit_price"] = float(_price_for_row(rng, r, pricing_settings))
-        out_rows.append(r)
+    # brand/category back to plain strings (universe keeps them as categoricals)
+    out = universe_df.iloc[idx].reset_index(drop=True).astype({"brand": str, "category": str})
 
-    out = pd.DataFrame(out_rows)
+    # Add price on sampling stage
+    out["unit_price"] = _prices(rng, out, pricing_settings)
 
-    out.insert(0, "product_id", range(1, len(out) + 1))
+    out.insert(0, "product_id", np.arange(1, len(out) + 1, dtype=np.int64))
 
     # Final column order
     out = out[["product_id", "product_name", "brand", "category", "gramm_g", "unit_price"]].copy()
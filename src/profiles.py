@@ -0,0 +1,319 @@
+import json
+import math
+
+from .sales import SalesTables, prepare_sales_tables
+from .samplers import AliasSampler
+
+
+# ==========================================================
+# BEHAVIOR PROFILES
+# - One weighted registry of named options per sales parameter
+# - Every customer draws each parameter independently (weight = relative share of customers);
+#   with the defaults below that is 7*4*5*3*5*1*5*5 = 52,500 combinations, all equally likely
+# - profile_id = combined index of the picked options (see encode_profile_id)
+# ==========================================================
+SETTINGS_PROFILES = {
+    "params": {
+        "p_buy_by_year": [
+            {"name": "growing_fast", "weight": 1.0, "value": [0.05, 0.07, 0.08, 0.09]},
+            {"name": "growing", "weight": 1.0, "value": [0.04, 0.06, 0.07, 0.08]},
+            {"name": "growing_slow_start", "weight": 1.0, "value": [0.02, 0.03, 0.04, 0.06]},
+            {"name": "growing_occasional", "weight": 1.0, "value": [0.01, 0.02, 0.03, 0.04]},
+            {"name": "declining", "weight": 1.0, "value": [0.06, 0.04, 0.03, 0.02]},
+            {"name": "declining_slow", "weight": 1.0, "value": [0.03, 0.02, 0.015, 0.01]},
+            {"name": "declining_rare", "weight": 1.0, "value": [0.01, 0.008, 0.006, 0.004]},
+        ],
+        "p_close_day": [
+            {"name": "very_low", "weight": 1.0, "value": 0.0001},
+            {"name": "low", "weight": 1.0, "value": 0.0002},
+            {"name": "medium", "weight": 1.0, "value": 0.0003},
+            {"name": "high", "weight": 1.0, "value": 0.0004},
+        ],
+        "p_invoice_by_nth": [
+            {"name": "multi_invoice", "weight": 1.0, "value": [1.00, 0.80, 0.50, 0.10]},
+            {"name": "some_repeat", "weight": 1.0, "value": [1.00, 0.15, 0.05, 0.01]},
+            {"name": "rare_repeat", "weight": 1.0, "value": [1.00, 0.05, 0.01, 0.00]},
+            {"name": "almost_single", "weight": 1.0, "value": [1.00, 0.01]},
+            {"name": "single", "weight": 1.0, "value": [1.00, 0.00]},
+        ],
+        "p_device_by_nth": [
+            {"name": "one_device", "weight": 1.0, "value": [0.99, 0.10, 0.00]},
+            {"name": "multi_device", "weight": 1.0, "value": [0.90, 0.35, 0.15, 0.01]},
+            {"name": "single_device", "weight": 1.0, "value": [0.95, 0.00]},
+        ],
+        "refill_count_probs": [
+            {"name": "large_baskets", "weight": 1.0, "value": [0.95, 0.80, 0.50, 0.10]},
+            {"name": "wide_baskets", "weight": 1.0, "value": [0.90, 0.75, 0.60, 0.30]},
+            {"name": "pairs", "weight": 1.0, "value": [0.85, 0.80, 0.20, 0.05]},
+            {"name": "small_baskets", "weight": 1.0, "value": [0.70, 0.30, 0.10, 0.05]},
+            {"name": "smallest_baskets", "weight": 1.0, "value": [0.60, 0.30, 0.10, 0.05]},
+        ],
+        "p_refill_invoice": [
+            {"name": "default", "weight": 1.0, "value": 0.95},
+        ],
+        "p_accessory_invoice": [
+            {"name": "often", "weight": 1.0, "value": 0.08},
+            {"name": "regular", "weight": 1.0, "value": 0.06},
+            {"name": "sometimes", "weight": 1.0, "value": 0.05},
+            {"name": "rare", "weight": 1.0, "value": 0.03},
+            {"name": "never", "weight": 1.0, "value": 0.00},
+        ],
+        "p_spare_part_invoice": [
+            {"name": "often", "weight": 1.0, "value": 0.10},
+            {"name": "regular", "weight": 1.0, "value": 0.05},
+            {"name": "sometimes", "weight": 1.0, "value": 0.03},
+            {"name": "rare", "weight": 1.0, "value": 0.01},
+            {"name": "never", "weight": 1.0, "value": 0.00},
+        ],
+    },
+}
+
+# Parameters every registry must define (passed straight to the sales engine).
+# Order matters: it fixes how option indexes are combined into profile_id.
+PROFILE_PARAMS = (
+    "p_buy_by_year",
+    "p_close_day",
+    "p_invoice_by_nth",
+    "p_device_by_nth",
+    "refill_count_probs",
+    "p_refill_invoice",
+    "p_accessory_invoice",
+    "p_spare_part_invoice",
+)
+
+# Value shapes: list params hold non-empty lists of non-negative numbers, scalar params a probability
+LIST_PARAMS = ("p_buy_by_year", "p_invoice_by_nth", "p_device_by_nth", "refill_count_probs")
+
+
+def _is_number(x) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool) and math.isfinite(x)
+
+
+def _check_value(param: str, name: str, value) -> None:
+    where = f"{param} option {name!r}"
+    if param in LIST_PARAMS:
+        if not isinstance(value, list) or not value:
+            raise ValueError(f"{where}: value must be a non-empty list of numbers.")
+        if not all(_is_number(v) and v >= 0 for v in value):
+            raise ValueError(f"{where}: list values must be numbers >= 0.")
+        if param == "refill_count_probs" and sum(value) <= 0:
+            raise ValueError(f"{where}: refill_count_probs must contain positive values.")
+    elif not (_is_number(value) and 0.0 <= value <= 1.0):
+        raise ValueError(f"{where}: value must be a probability in [0, 1].")
+
+
+# profile_id is an int64: the product of option counts must stay below 2**63
+MAX_PROFILES = 2**63 - 1
+
+
+def validate_profiles(params: dict) -> dict:
+    """
+    Check a profile registry (same shape as SETTINGS_PROFILES["params"]) and return it.
+
+    Every option value is checked here, because sales tables are built lazily: a bad value
+    would otherwise only fail once the first customer who drew it is simulated.
+    """
+    missing = [k for k in PROFILE_PARAMS if k not in params]
+    if missing:
+        raise ValueError(f"Profiles are missing: {', '.join(missing)}.")
+    unknown = [k for k in params if k not in PROFILE_PARAMS]
+    if unknown:
+        raise ValueError(f"Unknown profile parameters: {', '.join(unknown)}.")
+
+    for param in PROFILE_PARAMS:
+        options = params[param]
+        if not options:
+            raise ValueError(f"{param} needs at least one option.")
+
+        seen = set()
+        for i, opt in enumerate(options):
+            name = opt.get("name")
+            if not name:
+                raise ValueError(f"{param} option #{i} has no name.")
+            if name in seen:
+                raise ValueError(f"Duplicate {param} option name {name!r}.")
+            seen.add(name)
+            if "value" not in opt:
+                raise ValueError(f"{param} option {name!r} has no value.")
+            _check_value(param, name, opt["value"])
+            if float(opt.get("weight", 1.0)) < 0:
+                raise ValueError(f"{param} option {name!r} weight must be >= 0.")
+
+        if sum(float(o.get("weight", 1.0)) for o in options) <= 0:
+            raise ValueError(f"{param} weights must contain positive values.")
+
+    # profile_id is stored as int64 (customers.profile_id, ProfileSampler.draw_many)
+    if n_profiles(params) > MAX_PROFILES:
+        raise ValueError(
+            f"Too many option combinations ({n_profiles(params)}); profile_id must fit into int64 "
+            f"(at most {MAX_PROFILES} combinations)."
+        )
+
+    return params
+
+
+def load_profiles(path) -> dict:
+    """
+    Load a profile registry from a JSON file.
+
+    Accepted shapes:
+      {"params": {param: [ {...}, ... ], ...}}   (same as SETTINGS_PROFILES)
+      {param: [ {...}, ... ], ...}
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    params = data.get("params", data)
+    return validate_profiles(params)
+
+
+def save_profiles(params: dict, path) -> None:
+    """
+    Write a profile registry as JSON (loadable with load_profiles / --profiles-file).
+    Option order is preserved, so profile_id values in customers.csv stay valid.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"params": {k: params[k] for k in PROFILE_PARAMS}}, f, indent=2)
+
+
+# ==========================================================
+# profile_id <-> option indexes
+# - Mixed radix over PROFILE_PARAMS; the last parameter varies fastest
+# ==========================================================
+def _strides(params: dict) -> list[int]:
+    strides = []
+    stride = 1
+    for param in reversed(PROFILE_PARAMS):
+        strides.append(stride)
+        stride *= len(params[param])
+    return strides[::-1]
+
+
+def n_profiles(params: dict) -> int:
+    out = 1
+    for param in PROFILE_PARAMS:
+        out *= len(params[param])
+    return out
+
+
+def encode_profile_id(params: dict, option_indexes: dict) -> int:
+    """
+    {param: option index} -> profile_id
+    """
+    return sum(int(option_indexes[p]) * s for p, s in zip(PROFILE_PARAMS, _strides(params)))
+
+
+def decode_profile_id(params: dict, profile_id: int) -> dict:
+    """
+    profile_id -> {param: option index}
+    """
+    profile_id = int(profile_id)
+    if not 0 <= profile_id < n_profiles(params):
+        raise ValueError(f"profile_id {profile_id} is out of range.")
+    return {
+        p: (profile_id // s) % len(params[p])
+        for p, s in zip(PROFILE_PARAMS, _strides(params))
+    }
+
+
+def describe_profile(params: dict, profile_id: int) -> dict:
+    """
+    profile_id -> {param: option name} (for reports / analysis)
+    """
+    return {p: params[p][i]["name"] for p, i in decode_profile_id(params, profile_id).items()}
+
+
+class ProfileSampler:
+    """
+    Draws profile_id values: one independent weighted pick per parameter, combined into one id.
+
+    draw(rng) / draw_many(size, np_rng) mirror AliasSampler, so it can be used the same way.
+    """
+
+    __slots__ = ("samplers", "strides")
+
+    def __init__(self, params: dict):
+        self.samplers = [
+            AliasSampler(range(len(params[p])), [float(o.get("weight", 1.0)) for o in params[p]])
+            for p in PROFILE_PARAMS
+        ]
+        self.strides = _strides(params)
+
+    def draw(self, rng) -> int:
+        return sum(sampler.draw(rng) * s for sampler, s in zip(self.samplers, self.strides))
+
+    def draw_many(self, size: int, np_rng=None):
+        """
+        Batched draw path: returns an int64 NumPy array of `size` profile ids.
+        """
+        import numpy as np
+
+        if np_rng is None:
+            np_rng = np.random.default_rng()
+
+        out = np.zeros(int(size), dtype=np.int64)
+        for sampler, s in zip(self.samplers, self.strides):
+            out += sampler.draw_many(size, np_rng).astype(np.int64) * s
+        return out
+
+
+class ProfileTables:
+    """
+    SalesTables by profile_id, built on first use and memoized (only profiles that actually
+    occur are ever built). With many option combinations most profile_ids belong to one or
+    a few customers; what every table shares are the product/store and refill count samplers.
+    """
+
+    def __init__(self, params: dict, *, product_samplers: dict, store_ids, stop_invoices_on_lost_day: bool = True):
+        self.params = params
+        self.product_samplers = product_samplers
+        self.store_ids = store_ids
+        self.stop_invoices_on_lost_day = stop_invoices_on_lost_day
+        # Refill count samplers are shared by all profiles with the same refill option
+        self._refill_samplers = [AliasSampler.from_probs(o["value"]) for o in params["refill_count_probs"]]
+        self._tables = {}
+
+    def __len__(self):
+        return n_profiles(self.params)
+
+    def __getitem__(self, profile_id) -> SalesTables:
+        profile_id = int(profile_id)
+        tables = self._tables.get(profile_id)
+        if tables is None:
+            tables = self._tables[profile_id] = self._build(profile_id)
+        return tables
+
+    def _build(self, profile_id: int) -> SalesTables:
+        picks = decode_profile_id(self.params, profile_id)
+        values = {p: self.params[p][i]["value"] for p, i in picks.items()}
+        values["refill_count_probs"] = self._refill_samplers[picks["refill_count_probs"]]
+        samplers = self.product_samplers
+        return prepare_sales_tables(
+            device_product_ids=samplers.get("DEVICE", []),
+            refill_product_ids=samplers.get("REFILL", []),
+            accessory_product_ids=samplers.get("ACCESSORY", []),
+            spare_part_product_ids=samplers.get("SPARE_PART", []),
+            store_ids=self.store_ids,
+            stop_invoices_on_lost_day=self.stop_invoices_on_lost_day,
+            **values,
+        )
+
+
+def build_profile_tables(
+    params: dict,
+    *,
+    product_samplers: dict,
+    store_ids,
+    stop_invoices_on_lost_day: bool = True,
+) -> ProfileTables:
+    """
+    SalesTables for every profile_id (index = profile_id), built lazily.
+
+    product_samplers: {category: product ids list or AliasSampler} (see build_product_samplers)
+    store_ids: store ids list or AliasSampler
+    """
+    return ProfileTables(
+        params,
+        product_samplers=product_samplers,
+        store_ids=store_ids,
+        stop_invoices_on_lost_day=stop_invoices_on_lost_day,
+    )
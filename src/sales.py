@@ -1,6 +1,8 @@
 from datetime import date, timedelta
 import random
 
+from .samplers import AliasSampler
+
 def _month_start(d):
     return date(d.year, d.month, 1)
 
@@ -24,23 +26,20 @@ def _value_by_index(values, idx):
 def _pick_one(rng, values):
     if not values:
         raise ValueError("List must not be empty.")
+    if isinstance(values, AliasSampler):
+        return values.draw(rng)
     return values[rng.randrange(len(values))]
 
 
-def _sample_refill_count(rng, probs):
+def _refill_count_sampler(probs):
     # probs[0] => 1 refill, probs[1] => 2 refills, ...
+    if isinstance(probs, AliasSampler):
+        return probs
     if not probs:
         raise ValueError("refill_count_probs must not be empty.")
-    total = float(sum(probs))
-    if total <= 0:
+    if float(sum(probs)) <= 0:
         raise ValueError("refill_count_probs must contain positive values.")
-    x = rng.random() * total
-    acc = 0.0
-    for i, p in enumerate(probs):
-        acc += float(p)
-        if x <= acc:
-            return i + 1
-    return len(probs)
+    return AliasSampler.from_probs(probs)
 
 
 def _parse_iso_date(s):
@@ -49,16 +48,81 @@ def _parse_iso_date(s):
     return date.fromisoformat(s)
 
 
+class SalesTables:
+    """
+    Validated, precomputed inputs of the sales engine.
+
+    Built once per behavior profile (see prepare_sales_tables) and reused for every
+    customer with that profile. The heavy parts (product/store samplers, refill count
+    samplers) are shared objects, so a table is cheap to build even when few customers reuse it.
+    """
+
+    __slots__ = (
+        "device_product_ids", "refill_product_ids", "accessory_product_ids", "spare_part_product_ids",
+        "store_ids", "p_buy_by_year", "p_close_day", "p_invoice_by_nth", "p_device_by_nth",
+        "refill_count_sampler", "p_refill_invoice", "p_accessory_invoice", "p_spare_part_invoice",
+        "stop_invoices_on_lost_day",
+    )
+
+
+def prepare_sales_tables(
+    *,
+    device_product_ids: list[int] | AliasSampler,
+    refill_product_ids: list[int] | AliasSampler,
+    accessory_product_ids: list[int] | AliasSampler,
+    spare_part_product_ids: list[int] | AliasSampler,
+    store_ids: list[int] | AliasSampler,
+    p_buy_by_year: list[float],
+    p_close_day: float,
+    p_invoice_by_nth: list[float],
+    p_device_by_nth: list[float],
+    refill_count_probs: list[float] | AliasSampler,
+    p_refill_invoice: float = 1.0,
+    p_accessory_invoice: float = 0.0,
+    p_spare_part_invoice: float = 0.0,
+    stop_invoices_on_lost_day: bool = True,
+) -> SalesTables:
+    """
+    Validate sales parameters and precompute lookup tables.
+    Parameters have the same meaning as in generate_customer_sales_rows().
+    """
+    if not store_ids:
+        raise ValueError("store_ids must be provided and non-empty.")
+    if not p_buy_by_year:
+        raise ValueError("p_buy_by_year must not be empty.")
+    if not p_invoice_by_nth:
+        raise ValueError("p_invoice_by_nth must not be empty.")
+    if not p_device_by_nth:
+        raise ValueError("p_device_by_nth must not be empty.")
+
+    t = SalesTables()
+    t.device_product_ids = device_product_ids
+    t.refill_product_ids = refill_product_ids
+    t.accessory_product_ids = accessory_product_ids
+    t.spare_part_product_ids = spare_part_product_ids
+    t.store_ids = store_ids
+    t.p_buy_by_year = [float(p) for p in p_buy_by_year]
+    t.p_close_day = float(p_close_day)
+    t.p_invoice_by_nth = [float(p) for p in p_invoice_by_nth]
+    t.p_device_by_nth = [float(p) for p in p_device_by_nth]
+    t.refill_count_sampler = _refill_count_sampler(refill_count_probs)
+    t.p_refill_invoice = float(p_refill_invoice)
+    t.p_accessory_invoice = float(p_accessory_invoice)
+    t.p_spare_part_invoice = float(p_spare_part_invoice)
+    t.stop_invoices_on_lost_day = bool(stop_invoices_on_lost_day)
+    return t
+
+
 def generate_customer_sales_rows(
     *,
     customer_id: int,
     sales_start_date: str,
     sales_end_date: str,
-    device_product_ids: list[int],
-    refill_product_ids: list[int],
-    accessory_product_ids: list[int],
-    spare_part_product_ids: list[int],
-    store_ids: list[int],
+    device_product_ids: list[int] | AliasSampler,
+    refill_product_ids: list[int] | AliasSampler,
+    accessory_product_ids: list[int] | AliasSampler,
+    spare_part_product_ids: list[int] | AliasSampler,
+    store_ids: list[int] | AliasSampler,
 
     # Day-based probabilities now:
     p_buy_by_year: list[float],      # interpreted as DAILY probability schedule by customer-year
@@ -69,13 +133,16 @@ def generate_customer_sales_rows(
 
     # Basket composition:
     p_device_by_nth: list[float],
-    refill_count_probs: list[float],
+    refill_count_probs: list[float] | AliasSampler,
     p_refill_invoice: float = 1.0,
     p_accessory_invoice: float = 0.0,
     p_spare_part_invoice: float = 0.0,
 
     # Optional behavior: if True -> no invoices on the day customer becomes lost
     stop_invoices_on_lost_day: bool = True,
+
+    # Optional: seed for a reproducible history (None => fresh randomness)
+    seed: int | str | None = None,
 ) -> list[dict]:
     """
     Day-by-day sales generation for ONE customer.
@@ -93,24 +160,94 @@ def generate_customer_sales_rows(
         (If you want monthly meaning again, we can reintroduce a conversion, but you asked for "everything by days".)
       - revenue is 0.0 for now.
       - quantity is negative for return invoices.
+      - product/store id params accept a plain list (uniform pick) or an AliasSampler
+        (weighted pick, see src/samplers.py). refill_count_probs accepts either too.
+      - for many customers sharing the same parameters, build the tables once with
+        prepare_sales_tables() and call simulate_customer_sales_rows() instead.
+    """
+    tables = prepare_sales_tables(
+        device_product_ids=device_product_ids,
+        refill_product_ids=refill_product_ids,
+        accessory_product_ids=accessory_product_ids,
+        spare_part_product_ids=spare_part_product_ids,
+        store_ids=store_ids,
+        p_buy_by_year=p_buy_by_year,
+        p_close_day=p_close_day,
+        p_invoice_by_nth=p_invoice_by_nth,
+        p_device_by_nth=p_device_by_nth,
+        refill_count_probs=refill_count_probs,
+        p_refill_invoice=p_refill_invoice,
+        p_accessory_invoice=p_accessory_invoice,
+        p_spare_part_invoice=p_spare_part_invoice,
+        stop_invoices_on_lost_day=stop_invoices_on_lost_day,
+    )
+    return simulate_customer_sales_rows(
+        customer_id=customer_id,
+        sales_start_date=sales_start_date,
+        sales_end_date=sales_end_date,
+        tables=tables,
+        seed=seed,
+    )
+
+
+def generate_sales_rows(
+    *,
+    customers,
+    sales_end_date: str,
+    profile_tables,
+):
+    """
+    Simulate customers in the given order, each with the tables of its behavior profile.
+
+    customers: iterable of (customer_id, created_at, profile_id) tuples.
+    profile_tables: SalesTables by profile_id (see build_profile_tables in src/profiles.py).
+    Yields one list of rows per customer (empty lists are skipped).
+    """
+    for customer_id, created_at, profile_id in customers:
+        rows = simulate_customer_sales_rows(
+            customer_id=customer_id,
+            sales_start_date=created_at,
+            sales_end_date=sales_end_date,
+            tables=profile_tables[profile_id],
+        )
+        if rows:
+            yield rows
+
+
+def simulate_customer_sales_rows(
+    *,
+    customer_id: int,
+    sales_start_date: str,
+    sales_end_date: str,
+    tables: SalesTables,
+    seed: int | str | None = None,
+) -> list[dict]:
+    """
+    Day-by-day sales generation for ONE customer from precomputed tables.
+    Same output as generate_customer_sales_rows(); the same seed gives the same rows.
     """
     start_dt = _parse_iso_date(sales_start_date)
     end_dt = _parse_iso_date(sales_end_date)
 
-    rng = random.Random()
+    rng = random.Random(seed)
 
     if start_dt > end_dt:
         raise ValueError("sales_start_date must be <= sales_end_date.")
-    if not store_ids:
-        raise ValueError("store_ids must be provided and non-empty.")
-    if not p_buy_by_year:
-        raise ValueError("p_buy_by_year must not be empty.")
-    if not p_invoice_by_nth:
-        raise ValueError("p_invoice_by_nth must not be empty.")
-    if not p_device_by_nth:
-        raise ValueError("p_device_by_nth must not be empty.")
-    if not refill_count_probs:
-        raise ValueError("refill_count_probs must not be empty.")
+
+    device_product_ids = tables.device_product_ids
+    refill_product_ids = tables.refill_product_ids
+    accessory_product_ids = tables.accessory_product_ids
+    spare_part_product_ids = tables.spare_part_product_ids
+    store_ids = tables.store_ids
+    p_buy_by_year = tables.p_buy_by_year
+    p_close_day = tables.p_close_day
+    p_invoice_by_nth = tables.p_invoice_by_nth
+    p_device_by_nth = tables.p_device_by_nth
+    refill_count_sampler = tables.refill_count_sampler
+    p_refill_invoice = tables.p_refill_invoice
+    p_accessory_invoice = tables.p_accessory_invoice
+    p_spare_part_invoice = tables.p_spare_part_invoice
+    stop_invoices_on_lost_day = tables.stop_invoices_on_lost_day
 
     devices_owned = 0
     invoice_seq = 0
@@ -123,7 +260,7 @@ def generate_customer_sales_rows(
 
     while day_dt <= end_dt:
         # 1) Lost check (lost decision date)
-        if rng.random() < float(p_close_day):
+        if rng.random() < p_close_day:
             if not stop_invoices_on_lost_day:
                 # Allow invoices on lost day, but stop after generating today's invoices.
                 lost_today_but_allow_sales = True
@@ -141,7 +278,7 @@ def generate_customer_sales_rows(
         invoices_today = 0
         while invoices_today < HARD_MAX_INVOICES_PER_DAY:
             p_inv_nth = _value_by_index(p_invoice_by_nth, invoices_today)  # 0=>1st, 1=>2nd...
-            p_invoice_attempt = float(p_buy_day) * float(p_inv_nth)
+            p_invoice_attempt = p_buy_day * p_inv_nth
 
             if rng.random() >= p_invoice_attempt:
                 break
@@ -159,18 +296,18 @@ def generate_customer_sales_rows(
 
             # Refill lines?
             refill_lines = []
-            if refill_product_ids and (rng.random() < float(p_refill_invoice)):
-                n_refills = _sample_refill_count(rng, refill_count_probs)
+            if refill_product_ids and (rng.random() < p_refill_invoice):
+                n_refills = refill_count_sampler.draw(rng)
                 for _ in range(n_refills):
                     refill_lines.append(_pick_one(rng, refill_product_ids))
 
             # Add-ons
             accessory_line = None
-            if accessory_product_ids and (rng.random() < float(p_accessory_invoice)):
+            if accessory_product_ids and (rng.random() < p_accessory_invoice):
                 accessory_line = _pick_one(rng, accessory_product_ids)
 
             spare_line = None
-            if spare_part_product_ids and (rng.random() < float(p_spare_part_invoice)):
+            if spare_part_product_ids and (rng.random() < p_spare_part_invoice):
                 spare_line = _pick_one(rng, spare_part_product_ids)
 
             # Ensure at least one line
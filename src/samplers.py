@@ -0,0 +1,176 @@
+import random
+import warnings
+
+
+# ==========================================================
+# Alias-table categorical sampler (Walker / Vose)
+# - Built once per distribution, O(1) per draw
+# ==========================================================
+class AliasSampler:
+    """
+    Weighted categorical sampler over a fixed list of values.
+
+    Build cost is O(n); every draw is O(1) (one uniform number, one table lookup).
+
+    Parameters:
+      values
+        Values returned by draws (product ids, store ids, refill counts, ...).
+
+      weights
+        Non-negative weights aligned with values. None => uniform.
+
+    The sampler is truthy / sized like the values list, so it can be passed
+    wherever a plain list of ids was accepted before.
+    """
+
+    __slots__ = ("values", "prob", "alias")
+
+    def __init__(self, values, weights=None):
+        values = list(values)
+        if not values:
+            raise ValueError("AliasSampler values must not be empty.")
+
+        n = len(values)
+        if weights is None:
+            weights = [1.0] * n
+        weights = [float(w) for w in weights]
+        if len(weights) != n:
+            raise ValueError(f"Got {len(weights)} weights for {n} values.")
+        if any(w < 0 for w in weights):
+            raise ValueError("Weights must be >= 0.")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("Weights must contain positive values.")
+
+        # Vose: scale to mean 1.0, then pair every "small" column with a "large" donor
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Leftovers are 1.0 up to float error
+        for i in small + large:
+            prob[i] = 1.0
+            alias[i] = i
+
+        self.values = values
+        self.prob = prob
+        self.alias = alias
+
+    @classmethod
+    def from_probs(cls, probs):
+        """
+        Sampler over counts 1..len(probs): probs[0] => 1, probs[1] => 2, ...
+        (same meaning as refill_count_probs)
+        """
+        return cls(range(1, len(probs) + 1), probs)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __bool__(self):
+        return bool(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def draw_index(self, rng: random.Random) -> int:
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        # The fractional part of u is independent of i => reuse it as the coin flip
+        return i if (u - i) < self.prob[i] else self.alias[i]
+
+    def draw(self, rng: random.Random):
+        return self.values[self.draw_index(rng)]
+
+    def draw_many(self, size: int, np_rng=None):
+        """
+        Batched draw path: returns a NumPy array of `size` values.
+        np_rng: numpy Generator (a fresh default_rng() if None).
+        """
+        import numpy as np
+
+        if np_rng is None:
+            np_rng = np.random.default_rng()
+
+        n = len(self.prob)
+        u = np_rng.random(int(size)) * n
+        idx = u.astype(np.int64)
+        np.minimum(idx, n - 1, out=idx)
+        keep = (u - idx) < np.asarray(self.prob)[idx]
+        idx = np.where(keep, idx, np.asarray(self.alias)[idx])
+        return np.asarray(self.values)[idx]
+
+
+# ==========================================================
+# Weight helpers
+# ==========================================================
+def zipf_weights(n: int, s: float) -> list[float]:
+    """
+    Zipf popularity by rank: weight(k) = 1 / k**s for k = 1..n.
+    s = 0 => uniform.
+    """
+    s = float(s)
+    if s < 0:
+        raise ValueError("Zipf exponent must be >= 0.")
+    return [1.0 / (k ** s) for k in range(1, int(n) + 1)]
+
+
+def build_product_samplers(items_df, popularity_settings: dict, seed: int | str | None = None) -> dict:
+    """
+    One AliasSampler of product_id per category.
+
+    Popularity inside a category:
+      - explicit weight from popularity_settings["product_weights"][product_name], if present
+      - otherwise Zipf by rank; ranks are a random permutation per category (seeded by `seed`),
+        so popularity is not tied to product_id order
+
+    product_weights names that match no product in items_df trigger a warning (likely a typo).
+
+    Returns:
+      {category: AliasSampler}  (categories with no items are omitted)
+    """
+    s = float(popularity_settings.get("product_zipf_s", 0.0))
+    explicit = popularity_settings.get("product_weights", {}) or {}
+
+    unknown = sorted(set(explicit) - set(items_df["product_name"].tolist()))
+    if unknown:
+        warnings.warn(
+            f"product_weights names not found in the catalog (ignored): {', '.join(map(repr, unknown))}",
+            stacklevel=2,
+        )
+
+    samplers = {}
+    for category in items_df["category"].unique().tolist():
+        sub = items_df[items_df["category"] == category]
+        if sub.empty:
+            continue
+        ranks = zipf_weights(len(sub), s)
+        random.Random(None if seed is None else f"{seed}:{category}").shuffle(ranks)
+        weights = [
+            float(explicit.get(name, w))
+            for name, w in zip(sub["product_name"].tolist(), ranks)
+        ]
+        samplers[category] = AliasSampler(sub["product_id"].tolist(), weights)
+    return samplers
+
+
+def build_store_sampler(store_ids: list[int], popularity_settings: dict) -> AliasSampler:
+    """
+    AliasSampler of store_id. Stores not listed in popularity_settings["store_weights"] => 1.0.
+    """
+    weights_by_store = popularity_settings.get("store_weights", {}) or {}
+    weights = [float(weights_by_store.get(sid, weights_by_store.get(str(sid), 1.0))) for sid in store_ids]
+    return AliasSampler(store_ids, weights)
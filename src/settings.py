@@ -0,0 +1,114 @@
+# ==========================================================
+# UNIVERSE SETTINGS
+# - Defines the FULL possible catalog space (all combinations)
+# ==========================================================
+SETTINGS_UNIVERSE = {
+    # Brands
+    "device_brands": ["AromaDrive", "BreezeLine", "FreshNest"],
+    "refill_brands": ["Good Smell", "AromaWave", "FreshNest", "Citrus & Co", "BreezeLine"],
+
+    # Devices (templates)
+    "devices_catalog": [
+        "Diffuser Machine - Home",
+        "Diffuser Machine - Compact",
+        "Nebulizer Machine - Pro",
+        "Car Diffuser Machine - Clip",
+        "Car Diffuser Machine - Mini",
+    ],
+
+    # Accessories (templates)
+    "accessories_catalog": [
+        "Wall Bracket Mount",
+        "Hanging Strap",
+        "Decor Sticker Pack",
+        "Protective Sleeve",
+        "Travel Pouch",
+        "Cable Organizer Clip",
+        "Adhesive Mount Pad",
+        "Car Vent Holder",
+        "Desk Stand Base",
+        "Cleaning Wipes Pack",
+    ],
+
+    # Spare parts (templates)
+    "spare_parts_catalog": [
+        "Replacement Cap",
+        "Nozzle Holder",
+        "Scent Cartridge Holder",
+        "Seal Ring (O-Ring)",
+        "Diffuser Wick Set",
+        "Power Adapter",
+        "USB Cable",
+        "Clip Replacement",
+    ],
+
+    # Regular refill combinations (cross product)
+    "scents": ["Citrus", "Lavender", "Coffee", "Vanilla", "Ocean", "Jasmine", "Rose", "Mint", "Pine", "Chocolate"],
+    "refill_sizes_g": [10, 20, 30, 50, 100],
+
+    # Bulk refills: special industrial items
+    "bulk_refills": [
+        {"brand": "Good Smell", "scent": "Citrus",   "gramm_g": 500,  "suffix": "(Industrial)"},
+        {"brand": "AromaWave",  "scent": "Lavender", "gramm_g": 500,  "suffix": "(Industrial)"},
+        {"brand": "FreshNest",  "scent": "Coffee",   "gramm_g": 1000, "suffix": "(Industrial)"},
+    ],
+
+    # Popularity (used by sales generation, see src/samplers.py)
+    # - product_zipf_s: Zipf exponent for product picks within each category (0 => uniform)
+    # - product_weights: explicit weight by product_name (overrides Zipf for that product)
+    # - store_weights: weight by store_id (stores not listed => 1.0)
+    "popularity": {
+        "product_zipf_s": 1.0,
+        "product_weights": {},
+        "store_weights": {},
+    },
+}
+
+
+# ==========================================================
+# PRICING SETTINGS
+# - Simple hardcoded model with tunable knobs
+# ==========================================================
+SETTINGS_PRICING = {
+    # Category base price ranges (currency-agnostic)
+    # We will sample from these ranges and then apply brand/gramm adjustments + noise.
+    "base_ranges": {
+        "DEVICE": (180.0, 650.0),
+        "ACCESSORY": (12.0, 75.0),
+        "SPARE_PART": (18.0, 140.0),
+        "REFILL": (8.0, 30.0),  # base component for refills (final comes from gramm model)
+    },
+
+    # Brand multipliers (premium/eco)
+    # Brands not listed => 1.0
+    "brand_multiplier": {
+        "FreshNest": 1.10,
+        "AromaDrive": 1.05,
+        "BreezeLine": 1.00,
+        "Good Smell": 0.95,
+        "AromaWave": 1.00,
+        "Citrus & Co": 0.90,
+    },
+
+    # Refill price per gram model:
+    # - for small refills (10..100g): use price_per_g_small
+    # - for bulk refills (>= 500g): use price_per_g_bulk (cheaper per gram)
+    "price_per_g_small": 0.55,   # e.g. 50g => 27.5
+    "price_per_g_bulk": 0.22,    # e.g. 500g => 110
+
+    # Extra fixed packaging margin for refills
+    "refill_packaging_fee_small": 3.0,
+    "refill_packaging_fee_bulk": 12.0,
+
+    # Noise (applied multiplicatively)
+    "noise_pct": 0.08,  # ±8%
+
+    # Rounding
+    "round_to": 0.5,  # round to 0.5 increments (e.g., 12.0, 12.5, 13.0)
+}
+
+
+# ==========================================================
+# STORES
+# ==========================================================
+STORE_IDS = list(range(101, 110))
@@ -0,0 +1,347 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# ==========================================================
+# VALIDATION SETTINGS
+# ==========================================================
+SETTINGS_VALIDATE = {
+    # Rows of sales.csv read per chunk (memory stays bounded by this, not by file size)
+    "chunksize": 1_000_000,
+
+    # How many offending values to keep per error type (for the report)
+    "max_examples": 10,
+
+    # Histogram bin edges (left-inclusive; last bin is open-ended)
+    "lines_per_customer_bins": [0, 1, 2, 6, 11, 51, 101, 501, 1001],
+    "dormancy_gap_days_bins": [0, 1, 8, 31, 91, 181, 366, 731],
+}
+
+
+# ==========================================================
+# Id lookup: bitmap-style direct index or sorted array
+# ==========================================================
+class IdIndex:
+    """
+    Maps ids (customer_id / product_id) to positions 0..n-1, or -1 if unknown.
+
+    Dense ids (the generator emits 1..N) use a direct lookup array (one int32 per id);
+    sparse ids fall back to a sorted array + binary search.
+    """
+
+    def __init__(self, ids: np.ndarray):
+        ids = np.asarray(ids, dtype=np.int64)
+        self.n = len(ids)
+        uniq, first = np.unique(ids, return_index=True)
+        self.n_negative = int((uniq < 0).sum())
+
+        max_id = int(uniq[-1]) if len(uniq) else -1
+        self.dense = self.n_negative == 0 and max_id < 4 * max(len(uniq), 1) + 1_000_000
+        if self.dense:
+            self.table = np.full(max_id + 1, -1, dtype=np.int32)
+            self.table[ids] = np.arange(self.n, dtype=np.int32)
+        else:
+            self.sorted_ids = uniq
+            self.sorted_pos = first.astype(np.int32)
+
+    def lookup(self, ids: np.ndarray) -> np.ndarray:
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.dense:
+            pos = np.full(len(ids), -1, dtype=np.int32)
+            ok = (ids >= 0) & (ids < len(self.table))
+            pos[ok] = self.table[ids[ok]]
+            return pos
+        i = np.searchsorted(self.sorted_ids, ids)
+        i = np.minimum(i, len(self.sorted_ids) - 1)
+        hit = self.sorted_ids[i] == ids if len(self.sorted_ids) else np.zeros(len(ids), dtype=bool)
+        return np.where(hit, self.sorted_pos[i], -1).astype(np.int32)
+
+
+# NaT as int64 days (unparseable / missing dates)
+NAT_DAYS = np.iinfo(np.int64).min
+
+
+def _to_days(values) -> np.ndarray:
+    """
+    ISO 'YYYY-MM-DD' strings -> days since 1970-01-01 (int64). Unparseable => NAT_DAYS.
+    """
+    dt = pd.to_datetime(pd.Series(values), format="%Y-%m-%d", errors="coerce")
+    return dt.to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+
+def _to_ids(values: pd.Series):
+    """
+    Id column -> (int64 ids, valid mask). Blank / non-numeric / non-integer values are invalid (id -1).
+    """
+    if pd.api.types.is_integer_dtype(values.dtype):
+        ids = values.to_numpy(dtype=np.int64)
+        return ids, np.ones(len(ids), dtype=bool)
+    num = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(num) & (num == np.floor(num))
+    ids = np.full(len(num), -1, dtype=np.int64)
+    ids[valid] = num[valid].astype(np.int64)
+    return ids, valid
+
+
+def _prev_in_group(groups: np.ndarray, values: np.ndarray, carried: np.ndarray):
+    """
+    For rows in file order, return (order, groups_sorted, values_sorted, previous value of the same group),
+    where "previous" comes from earlier rows of the chunk or from `carried` (state of earlier chunks).
+    """
+    order = np.argsort(groups, kind="stable")
+    g = groups[order]
+    v = values[order]
+    first = np.ones(len(g), dtype=bool)
+    first[1:] = g[1:] != g[:-1]
+    prev = np.empty_like(v)
+    prev[first] = carried[g[first]]
+    prev[~first] = v[:-1][~first[1:]]
+    return order, g, v, prev
+
+
+class _Examples:
+    def __init__(self, limit: int):
+        self.limit = int(limit)
+        self.counts = {}
+        self.examples = {}
+
+    def add(self, name: str, values) -> None:
+        values = list(values)
+        if not values:
+            return
+        self.counts[name] = self.counts.get(name, 0) + len(values)
+        keep = self.examples.setdefault(name, [])
+        for v in values[: max(0, self.limit - len(keep))]:
+            keep.append(v.item() if hasattr(v, "item") else v)
+
+    def report(self) -> dict:
+        return {name: {"count": c, "examples": self.examples[name]} for name, c in sorted(self.counts.items())}
+
+
+def _bin_counts(values: np.ndarray, edges: list[int]) -> np.ndarray:
+    # Values below the first edge are not counted
+    idx = np.searchsorted(np.asarray(edges, dtype=np.int64), values, side="right") - 1
+    return np.bincount(idx[idx >= 0], minlength=len(edges))
+
+
+def _bin_labels(edges: list[int]) -> list[str]:
+    labels = []
+    for i, lo in enumerate(edges):
+        if i + 1 == len(edges):
+            labels.append(f"{lo}+")
+        else:
+            hi = edges[i + 1] - 1
+            labels.append(str(lo) if hi == lo else f"{lo}-{hi}")
+    return labels
+
+
+def _histogram(counts: np.ndarray, edges: list[int]) -> dict:
+    return {label: int(c) for label, c in zip(_bin_labels(edges), counts)}
+
+
+# ==========================================================
+# Streaming validation
+# ==========================================================
+def validate_outputs(out_dir, settings: dict = SETTINGS_VALIDATE) -> dict:
+    """
+    Validate generated outputs in one streaming pass over sales.csv.
+
+    Checks:
+      - every sales customer_id / product_id is an integer (blank / non-numeric => invalid_*_id)
+        and exists in customers.csv / items.csv
+      - invoice_date is a valid date and not before the customer's created_at
+      - invoice_id is unique: it must match "<customer_id>-<YYYYMMDD>-<seq>" of its row, and
+        per customer the seq must increase through the file (lines of one invoice are contiguous,
+        as written by the generator)
+
+    Stats (bounded memory: a few arrays per customer, nothing per sales line):
+      lines per customer histogram, invoices per year, category mix (lines), dormancy gaps
+      (days between consecutive invoices of a customer).
+
+    Returns:
+      {"ok": bool, "errors": {...}, "stats": {...}}
+    """
+    out_dir = Path(out_dir)
+    chunksize = int(settings["chunksize"])
+    errors = _Examples(settings["max_examples"])
+
+    # Masters
+    items = pd.read_csv(out_dir / "items.csv", usecols=["product_id", "category"])
+    products = IdIndex(items["product_id"].to_numpy())
+    categories, product_category = np.unique(items["category"].astype(str).to_numpy(), return_inverse=True)
+    errors.add("duplicate_product_id", items["product_id"][items["product_id"].duplicated()].to_numpy())
+
+    customers = pd.read_csv(out_dir / "customers.csv", usecols=["customer_id", "created_at"])
+    cust = IdIndex(customers["customer_id"].to_numpy())
+    created_day = _to_days(customers["created_at"].to_numpy())
+    errors.add("duplicate_customer_id", customers["customer_id"][customers["customer_id"].duplicated()].to_numpy())
+    errors.add("invalid_created_at", customers["customer_id"].to_numpy()[created_day == NAT_DAYS])
+    del customers, items
+
+    # Per-customer state (carried across chunks)
+    n_customers = cust.n
+    lines_per_customer = np.zeros(n_customers, dtype=np.int64)
+    last_seq = np.full(n_customers, -1, dtype=np.int64)
+    last_invoice_day = np.full(n_customers, NAT_DAYS, dtype=np.int64)
+
+    invoices_per_year = {}
+    category_lines = np.zeros(len(categories), dtype=np.int64)
+    gap_edges = settings["dormancy_gap_days_bins"]
+    gap_counts = np.zeros(len(gap_edges), dtype=np.int64)
+
+    n_lines = 0
+    n_invoices = 0
+
+    # Last row of the previous chunk (an invoice may straddle two chunks)
+    carry_invoice_id, carry_customer_id, carry_day = None, -1, NAT_DAYS
+
+    # A run without any sales (e.g. --n-customers 0) writes no sales.csv => zero lines
+    sales_path = out_dir / "sales.csv"
+    reader = []
+    if sales_path.exists():
+        reader = pd.read_csv(
+            sales_path,
+            usecols=["invoice_id", "customer_id", "invoice_date", "product_id"],
+            # Ids are not forced to int64: a blank / non-numeric id is reported, not a parse error
+            dtype={"invoice_id": str, "invoice_date": str},
+            chunksize=chunksize,
+        )
+    for chunk in reader:
+        n = len(chunk)
+        if n == 0:
+            continue
+        n_lines += n
+
+        invoice_id = chunk["invoice_id"].to_numpy(dtype=object)
+        customer_id, cust_ok = _to_ids(chunk["customer_id"])
+        product_id, prod_ok = _to_ids(chunk["product_id"])
+        day = _to_days(chunk["invoice_date"].to_numpy())
+
+        # 1) Ids and foreign keys
+        errors.add("invalid_customer_id", invoice_id[~cust_ok])
+        errors.add("invalid_product_id", invoice_id[~prod_ok])
+        cpos = np.where(cust_ok, cust.lookup(customer_id), -1)
+        ppos = np.where(prod_ok, products.lookup(product_id), -1)
+        errors.add("unknown_customer_id", customer_id[(cpos < 0) & cust_ok])
+        errors.add("unknown_product_id", product_id[(ppos < 0) & prod_ok])
+
+        # 2) Dates
+        bad_date = day == NAT_DAYS
+        errors.add("invalid_invoice_date", invoice_id[bad_date])
+        known = (cpos >= 0) & ~bad_date
+        before = np.zeros(n, dtype=bool)
+        before[known] = day[known] < created_day[cpos[known]]
+        errors.add("invoice_before_created_at", invoice_id[before])
+
+        # Stats: lines per customer, category mix
+        lines_per_customer += np.bincount(cpos[cpos >= 0], minlength=n_customers)
+        category_lines += np.bincount(product_category[ppos[ppos >= 0]], minlength=len(categories))
+
+        # 3) Invoices: first row of every invoice (lines of one invoice are contiguous)
+        is_new = np.empty(n, dtype=bool)
+        is_new[0] = invoice_id[0] != carry_invoice_id
+        is_new[1:] = invoice_id[1:] != invoice_id[:-1]
+
+        # Lines after the first one must agree with the invoice's customer/date
+        prev_cust = np.concatenate(([carry_customer_id], customer_id[:-1]))
+        prev_d = np.concatenate(([carry_day], day[:-1]))
+        disagree = ~is_new & ((customer_id != prev_cust) | (day != prev_d))
+        errors.add("invoice_lines_disagree", invoice_id[disagree])
+
+        carry_invoice_id, carry_customer_id, carry_day = invoice_id[-1], customer_id[-1], day[-1]
+
+        new_idx = np.flatnonzero(is_new)
+        n_invoices += len(new_idx)
+        if not len(new_idx):
+            # Chunk holds only continuation lines of an invoice started earlier
+            continue
+
+        parts = pd.Series(invoice_id[new_idx]).str.split("-", n=2, expand=True)
+        if parts.shape[1] < 3:
+            parts = parts.reindex(columns=range(3))
+        id_cust = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float)
+        id_ymd = parts[1].to_numpy(dtype=object)
+        id_seq = pd.to_numeric(parts[2], errors="coerce").to_numpy(dtype=float)
+        ymd = np.asarray(chunk["invoice_date"].to_numpy(dtype=object)[new_idx], dtype=str)
+        ymd = np.char.replace(ymd, "-", "")
+
+        malformed = (
+            np.isnan(id_cust) | np.isnan(id_seq)
+            | (id_cust != customer_id[new_idx])
+            | (np.asarray(id_ymd, dtype=str) != ymd)
+        )
+        malformed &= cust_ok[new_idx]  # rows with an invalid customer_id are already reported
+        errors.add("malformed_invoice_id", invoice_id[new_idx[malformed]])
+
+        ok = ~malformed & (cpos[new_idx] >= 0) & ~bad_date[new_idx]
+        inv_rows = new_idx[ok]
+        inv_cpos = cpos[inv_rows].astype(np.int64)
+        inv_seq = id_seq[ok].astype(np.int64)
+        inv_day = day[inv_rows]
+
+        if len(inv_rows):
+            # Uniqueness: per customer, seq must strictly increase
+            order, g, seq_sorted, prev_seq = _prev_in_group(inv_cpos, inv_seq, last_seq)
+            dup = seq_sorted <= prev_seq
+            errors.add("duplicate_invoice_id", invoice_id[inv_rows[order[dup]]])
+            np.maximum.at(last_seq, g, seq_sorted)
+
+            # Dormancy gaps between consecutive invoices of a customer
+            order, g, day_sorted, prev_day = _prev_in_group(inv_cpos, inv_day, last_invoice_day)
+            has_prev = prev_day != NAT_DAYS
+            gaps = day_sorted[has_prev] - prev_day[has_prev]
+            gap_counts += _bin_counts(gaps, gap_edges)
+            np.maximum.at(last_invoice_day, g, day_sorted)
+
+            # Invoices per year
+            years = inv_day.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+            y, c = np.unique(years, return_counts=True)
+            for yy, cc in zip(y.tolist(), c.tolist()):
+                invoices_per_year[yy] = invoices_per_year.get(yy, 0) + cc
+
+    line_edges = settings["lines_per_customer_bins"]
+    stats = {
+        "sales_lines": n_lines,
+        "invoices": n_invoices,
+        "customers": n_customers,
+        "customers_with_sales": int((lines_per_customer > 0).sum()),
+        "products": products.n,
+        "lines_per_customer": _histogram(_bin_counts(lines_per_customer, line_edges), line_edges),
+        "invoices_per_year": {str(y): invoices_per_year[y] for y in sorted(invoices_per_year)},
+        "category_mix": {str(cat): int(c) for cat, c in zip(categories, category_lines)},
+        "dormancy_gap_days": _histogram(gap_counts, gap_edges),
+    }
+
+    error_report = errors.report()
+    return {"ok": not error_report, "errors": error_report, "stats": stats}
+
+
+# ==========================================================
+# CLI: python run.py validate [--out-dir DIR] [--chunksize N] [--report FILE]
+# ==========================================================
+def main(argv=None, default_out_dir="output_csv") -> int:
+    p = argparse.ArgumentParser(prog="run.py validate", description="Validate generated outputs (streaming, bounded memory)")
+    p.add_argument("--out-dir", default=str(default_out_dir), help="Directory with items.csv, customers.csv, sales.csv")
+    p.add_argument("--chunksize", type=int, default=SETTINGS_VALIDATE["chunksize"], help="sales.csv rows per chunk")
+    p.add_argument("--report", default=None, help="Also write the JSON report to this file")
+    args = p.parse_args(argv)
+
+    print('data validation - started')
+    try:
+        report = validate_outputs(args.out_dir, {**SETTINGS_VALIDATE, "chunksize": args.chunksize})
+    except FileNotFoundError as e:
+        # items.csv / customers.csv are always written by a generation run
+        print(f'data validation - FAILED: {e.strerror}: {e.filename}')
+        return 1
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.report:
+        Path(args.report).write_text(text, encoding="utf-8")
+
+    print('data validation - ' + ('passed' if report["ok"] else 'FAILED'))
+    return 0 if report["ok"] else 1
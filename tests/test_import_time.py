@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("pandas", "numpy", "faker")
+
+# Budgets with generous headroom (measured: ~10 ms for the imports, ~0.2 s for `run.py -h`),
+# so they only trip when a heavy library sneaks back into the import path.
+IMPORT_BUDGET_S = 0.5
+CLI_HELP_BUDGET_S = 3.0
+
+
+def _run_python(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_sales_core_imports_without_heavy_libraries():
+    result = _run_python(
+        "import json, sys, time\n"
+        "t0 = time.perf_counter()\n"
+        "import src.sales, src.profiles, src.samplers, src.api\n"
+        "elapsed = time.perf_counter() - t0\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    assert result["heavy"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_S
+
+
+def test_cli_help_skips_heavy_libraries():
+    result = _run_python(
+        "import contextlib, io, json, runpy, sys\n"
+        "sys.argv = ['run.py', '-h']\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        runpy.run_path('run.py', run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'heavy': heavy}))\n"
+    )
+    assert result["heavy"] == []
+
+
+def test_cli_help_time_budget():
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "run.py", "-h"], cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - t0
+
+    assert out.returncode == 0
+    assert "usage" in out.stdout
+    assert elapsed < CLI_HELP_BUDGET_S
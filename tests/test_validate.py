@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from src.validate import SETTINGS_VALIDATE, main, validate_outputs
+
+ITEMS_CSV = """product_id,product_name,brand,category,gramm_g,unit_price
+1,AromaDrive Diffuser,AromaDrive,DEVICE,,120.0
+2,Good Smell Refill Citrus 30,Good Smell,REFILL,30,19.5
+3,AromaDrive Wall Mount,AromaDrive,ACCESSORY,,9.0
+"""
+
+CUSTOMERS_CSV = """customer_id,created_at,first_name,last_name,email,phone,email_opt_in,sms_opt_in,call_opt_in,profile_id
+1,2020-01-01,Ann,,,,0,0,0,0
+2,2020-06-15,Bob,,,,0,0,0,1
+3,2021-03-01,,,,,0,0,0,2
+"""
+
+SALES_HEADER = "invoice_id,customer_id,invoice_date,product_id,quantity,revenue,store_id\n"
+
+VALID_SALES = [
+    "1-20200101-000001,1,2020-01-01,1,1,0.0,101",
+    "1-20200101-000001,1,2020-01-01,2,2,0.0,101",
+    "1-20200101-000002,1,2020-01-01,2,1,0.0,102",
+    "1-20200301-000003,1,2020-03-01,2,1,0.0,101",
+    "2-20200615-000001,2,2020-06-15,1,1,0.0,103",
+    "2-20200615-000001,2,2020-06-15,2,1,0.0,103",
+    "2-20200615-000001,2,2020-06-15,3,1,0.0,103",
+    "2-20210101-000002,2,2021-01-01,2,1,0.0,104",
+]
+
+
+def _write_outputs(out_dir, sales_lines=None):
+    (out_dir / "items.csv").write_text(ITEMS_CSV, encoding="utf-8")
+    (out_dir / "customers.csv").write_text(CUSTOMERS_CSV, encoding="utf-8")
+    if sales_lines is not None:
+        text = SALES_HEADER + "".join(line + "\n" for line in sales_lines)
+        (out_dir / "sales.csv").write_text(text, encoding="utf-8")
+    return out_dir
+
+
+def _validate(out_dir, chunksize=SETTINGS_VALIDATE["chunksize"]):
+    return validate_outputs(out_dir, {**SETTINGS_VALIDATE, "chunksize": chunksize})
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 1_000_000])
+def test_valid_outputs_pass_for_any_chunksize(tmp_path, chunksize):
+    report = _validate(_write_outputs(tmp_path, VALID_SALES), chunksize)
+
+    assert report["ok"], report["errors"]
+    stats = report["stats"]
+    assert stats["sales_lines"] == 8
+    assert stats["invoices"] == 5
+    assert stats["customers_with_sales"] == 2
+    assert stats["invoices_per_year"] == {"2020": 4, "2021": 1}
+    assert stats["category_mix"] == {"ACCESSORY": 1, "DEVICE": 2, "REFILL": 5}
+    assert report == _validate(tmp_path)
+
+
+def test_header_only_sales(tmp_path):
+    report = _validate(_write_outputs(tmp_path, []), chunksize=2)
+
+    assert report["ok"]
+    assert report["stats"]["sales_lines"] == 0
+    assert report["stats"]["invoices"] == 0
+
+
+def test_missing_sales_counts_as_zero_lines(tmp_path):
+    report = _validate(_write_outputs(tmp_path))
+
+    assert report["ok"]
+    assert report["stats"]["sales_lines"] == 0
+
+
+def test_unknown_foreign_keys(tmp_path):
+    sales = VALID_SALES + [
+        "9-20210101-000001,9,2021-01-01,2,1,0.0,101",
+        "2-20210201-000003,2,2021-02-01,99,1,0.0,101",
+    ]
+    report = _validate(_write_outputs(tmp_path, sales), chunksize=3)
+
+    assert not report["ok"]
+    assert report["errors"]["unknown_customer_id"] == {"count": 1, "examples": [9]}
+    assert report["errors"]["unknown_product_id"] == {"count": 1, "examples": [99]}
+
+
+def test_invalid_ids_are_reported_not_raised(tmp_path):
+    sales = VALID_SALES + [
+        "3-20210301-000001,,2021-03-01,2,1,0.0,101",
+        "3-20210302-000002,3,2021-03-02,abc,1,0.0,101",
+    ]
+    report = _validate(_write_outputs(tmp_path, sales), chunksize=2)
+
+    assert not report["ok"]
+    assert report["errors"]["invalid_customer_id"]["examples"] == ["3-20210301-000001"]
+    assert report["errors"]["invalid_product_id"]["examples"] == ["3-20210302-000002"]
+    assert "unknown_customer_id" not in report["errors"]
+    assert "unknown_product_id" not in report["errors"]
+
+
+def test_dates(tmp_path):
+    sales = VALID_SALES + [
+        "3-20210201-000001,3,2021-02-01,2,1,0.0,101",   # before created_at (2021-03-01)
+        "3-20210399-000002,3,2021-03-99,2,1,0.0,101",   # not a date
+    ]
+    report = _validate(_write_outputs(tmp_path, sales), chunksize=1)
+
+    assert not report["ok"]
+    assert report["errors"]["invoice_before_created_at"]["examples"] == ["3-20210201-000001"]
+    assert report["errors"]["invalid_invoice_date"]["examples"] == ["3-20210399-000002"]
+
+
+def test_duplicate_invoice_id(tmp_path):
+    # Invoice 1-...-000001 reappears after other invoices of the same customer
+    sales = VALID_SALES + ["1-20200101-000001,1,2020-01-01,2,1,0.0,101"]
+    report = _validate(_write_outputs(tmp_path, sales), chunksize=3)
+
+    assert not report["ok"]
+    assert report["errors"]["duplicate_invoice_id"]["examples"] == ["1-20200101-000001"]
+
+
+def test_cli_exit_codes(tmp_path, capsys):
+    _write_outputs(tmp_path, VALID_SALES)
+    report_path = tmp_path / "report.json"
+    assert main(["--out-dir", str(tmp_path), "--chunksize", "2", "--report", str(report_path)]) == 0
+    assert json.loads(report_path.read_text(encoding="utf-8"))["ok"]
+
+    assert main(["--out-dir", str(tmp_path / "missing")]) == 1
+    assert "FAILED" in capsys.readouterr().out